@@ -536,6 +536,40 @@ class ImprovedChat(NLTKChat):
                 
             return error_msg
     
+    def respond_many(self, user_inputs):
+        """
+        Generate responses for a sequence of user inputs
+        
+        Inputs are answered in order, so each one sees the conversation
+        history left by the previous ones, exactly as with repeated respond().
+        
+        Args:
+            user_inputs (iterable): User messages to respond to
+            
+        Returns:
+            list: One response per input
+        """
+        respond = self.respond
+        return [respond(user_input) for user_input in user_inputs]
+
+    def uses_callback(self, user_input):
+        """
+        Check whether user input matches a pattern answered by a callback
+        
+        Callback replies (weather, stored names and favorites, renaming the
+        bot) depend on live data or change state, so they must not be reused.
+        
+        Args:
+            user_input (str): User message
+            
+        Returns:
+            bool: True if any callback pattern matches the input
+        """
+        return any(
+            isinstance(response, tuple) and pattern.search(user_input)
+            for pattern, response in self._pairs
+        )
+    
     def get_conversation_context(self, max_turns=3):
         """
         Get the recent conversation history as context for response generation
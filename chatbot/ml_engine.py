@@ -276,6 +276,42 @@ class IntentClassifier:
             logger.error(f"Error during prediction: {e}")
             return {"intent": None, "confidence": 0.0, "error": str(e)}
     
+    def predict_batch(self, texts):
+        """
+        Predict the intents of many user messages in a single pipeline call
+        
+        Args:
+            texts (list): User message texts
+            
+        Returns:
+            tuple: (intents, confidences) arrays aligned with texts; an intent is
+                None where the confidence is below the threshold
+        """
+        intents = np.full(len(texts), None, dtype=object)
+        confidences = np.zeros(len(texts), dtype=np.float64)
+        
+        if self.pipeline is None or not self.classes:
+            logger.warning("Model not trained yet")
+            return intents, confidences
+        
+        if len(texts) == 0:
+            return intents, confidences
+        
+        try:
+            # One predict_proba call vectorizes and scores the whole batch
+            intent_probs = self.pipeline.predict_proba(list(texts))
+            max_idx = intent_probs.argmax(axis=1)
+            confidences = intent_probs[np.arange(len(texts)), max_idx]
+            
+            # Only keep intents whose confidence is above threshold
+            accepted = confidences >= self.confidence_threshold
+            intents[accepted] = np.asarray(self.classes, dtype=object)[max_idx[accepted]]
+            
+        except Exception as e:
+            logger.error(f"Error during batch prediction: {e}")
+        
+        return intents, confidences
+    
     def save_model(self, path=None):
         """
         Save the trained model to disk
@@ -166,7 +166,9 @@ def copy_project_files(config):
     core_files = [
         "config.json",
         "memory.json",
-        "app.py"
+        "app.py",
+        "nltk_setup.py",
+        "download_nltk_data.py"
     ]
     
     # Directories to copy
@@ -2,9 +2,15 @@
 # A system for collecting and processing user feedback to improve the chatbot
 
 import os
+import gzip
 import json
+import shutil
+import time
+import queue
+import atexit
 import logging
 import datetime
+import threading
 from pathlib import Path
 
 # Set up logging
@@ -15,18 +21,203 @@ logging.basicConfig(
 logger = logging.getLogger("chatbot.feedback")
 
 # Define constants
-FEEDBACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "feedback")
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FEEDBACK_DIR = os.path.join(BASE_DIR, "data", "feedback")
 APPROVED_FILE = os.path.join(FEEDBACK_DIR, "approved_examples.json")
 REJECTED_FILE = os.path.join(FEEDBACK_DIR, "rejected_examples.json")
-TRAINING_DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "intent_training_data.json")
+TRAINING_DATA_FILE = os.path.join(BASE_DIR, "data", "intent_training_data.json")
+
+# Path objects reused by the helpers below
+APPROVED_PATH = Path(APPROVED_FILE)
+REJECTED_PATH = Path(REJECTED_FILE)
+TRAINING_DATA_PATH = Path(TRAINING_DATA_FILE)
+
+# Newline-separated set of normalized training texts, used for dedup, after a
+# header line holding the number of training entries
+TRAINING_INDEX_PATH = Path(TRAINING_DATA_FILE + ".idx")
+TRAINING_INDEX_HEADER = "# entries: "
+
+# Pretty-print feedback files only when debugging; compact output is much faster to encode
+DEBUG = os.environ.get("FEEDBACK_DEBUG", "").lower() in ("1", "true", "yes")
+
+# Maximum number of queued feedback entries written in a single batch
+FLUSH_BATCH_SIZE = 32
 
 # Ensure directories exist
 os.makedirs(FEEDBACK_DIR, exist_ok=True)
 
+# Feedback is handed to a background writer so store_feedback never waits on disk
+_feedback_queue = queue.Queue()
+_writer_thread = None
+_writer_start_lock = threading.Lock()
+# Serializes read-modify-write cycles on the feedback files
+_file_lock = threading.Lock()
+
+def _write_feedback_file(path, entries):
+    """
+    Write feedback entries to disk, streaming the encoder output chunk by chunk
+    
+    Args:
+        path (Path): Target feedback file
+        entries (list): Feedback entries to write
+    """
+    if DEBUG:
+        encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+    else:
+        encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    
+    with Path(path).open('w', encoding='utf-8') as f:
+        for chunk in encoder.iterencode(entries):
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+
+def _pending_path(target_path):
+    """Sidecar file holding entries that could not be written to target_path yet"""
+    return target_path.with_name(target_path.name + ".pending")
+
+def _load_pending(pending_path):
+    """Load the entries kept in a pending sidecar (one JSON object per line)"""
+    if not pending_path.exists():
+        return []
+    with pending_path.open('r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _write_feedback_batch(batch):
+    """
+    Append a batch of queued feedback entries, with one read-modify-write per file
+    
+    Entries that can't be written are appended to the file's .pending sidecar
+    instead of being dropped; the next successful write merges them in.
+    
+    Args:
+        batch (list): (target_path, entry) tuples taken from the queue
+    """
+    pending = {}
+    for target_path, entry in batch:
+        pending.setdefault(target_path, []).append(entry)
+    
+    with _file_lock:
+        for target_path, new_entries in pending.items():
+            pending_path = _pending_path(target_path)
+            try:
+                carried = _load_pending(pending_path)
+                
+                # Load existing entries if file exists
+                entries = []
+                if target_path.exists():
+                    with target_path.open('r', encoding='utf-8') as f:
+                        entries = json.load(f)
+                
+                entries.extend(carried)
+                entries.extend(new_entries)
+                _write_feedback_file(target_path, entries)
+                if carried:
+                    pending_path.unlink()
+                
+                logger.info(f"Stored {len(carried) + len(new_entries)} feedback entries in {target_path.name}")
+            except Exception as e:
+                logger.error(f"Error storing feedback in {target_path.name}, keeping it in {pending_path.name}: {e}")
+                try:
+                    with pending_path.open('a', encoding='utf-8') as f:
+                        for entry in new_entries:
+                            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.error(f"Lost {len(new_entries)} feedback entries: {e}")
+
+def _feedback_writer():
+    """Drain the feedback queue, writing whatever has accumulated in one batch"""
+    while True:
+        batch = [_feedback_queue.get()]
+        while len(batch) < FLUSH_BATCH_SIZE:
+            try:
+                batch.append(_feedback_queue.get_nowait())
+            except queue.Empty:
+                break
+        
+        try:
+            _write_feedback_batch(batch)
+        finally:
+            for _ in batch:
+                _feedback_queue.task_done()
+
+def _ensure_writer():
+    """Start the background feedback writer on first use"""
+    global _writer_thread
+    with _writer_start_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(target=_feedback_writer, name="feedback-writer", daemon=True)
+            _writer_thread.start()
+
+def flush_feedback():
+    """Block until all queued feedback has been written to disk"""
+    _feedback_queue.join()
+
+# Don't lose queued feedback when the interpreter exits
+atexit.register(flush_feedback)
+
+def _load_training_data():
+    """Load the full training data list, or an empty list if it doesn't exist"""
+    if not TRAINING_DATA_PATH.exists():
+        return []
+    with TRAINING_DATA_PATH.open('r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_training_index():
+    """
+    Load the persisted dedup index of normalized training texts
+    
+    Returns:
+        tuple: (set of indexed texts, number of training entries), or None if
+               the index is missing, in an older format or older than the
+               training data file
+    """
+    try:
+        if TRAINING_INDEX_PATH.stat().st_mtime < TRAINING_DATA_PATH.stat().st_mtime:
+            return None
+        header, _, body = TRAINING_INDEX_PATH.read_text(encoding='utf-8').partition("\n")
+        if not header.startswith(TRAINING_INDEX_HEADER):
+            return None
+        return set(body.splitlines()), int(header[len(TRAINING_INDEX_HEADER):])
+    except (OSError, ValueError):
+        return None
+
+def _save_training_index(existing_texts, entry_count):
+    """Persist the dedup index and the training entry count alongside the training data file"""
+    try:
+        TRAINING_INDEX_PATH.write_text(
+            f"{TRAINING_INDEX_HEADER}{entry_count}\n" + "\n".join(existing_texts), encoding='utf-8'
+        )
+    except OSError as e:
+        logger.warning(f"Could not write training data index: {e}")
+
+def _entry_ts_ns(entry):
+    """
+    Get a feedback entry's timestamp in nanoseconds since the epoch
+    
+    Args:
+        entry (dict): Feedback entry
+        
+    Returns:
+        int: The timestamp, or None if the entry has no usable timestamp
+    """
+    ts_ns = entry.get("ts_ns")
+    if ts_ns is None and "timestamp" in entry:
+        # Entries written before ts_ns was introduced carry an ISO string
+        try:
+            ts_ns = int(datetime.datetime.fromisoformat(entry["timestamp"]).timestamp() * 1e9)
+        except (ValueError, TypeError):
+            return None
+    return ts_ns
+
 def store_feedback(user_input, response, quality, intent=None, user_id=None):
     """
     Store user feedback about a chatbot response
     
+    The entry is written by a background thread, so a failed write is not
+    reported to the caller: it is logged, and the entry is kept in a
+    .pending file next to the feedback file until a later write succeeds.
+    
     Args:
         user_input (str): The user's message
         response (str): The chatbot's response
@@ -35,7 +226,7 @@ def store_feedback(user_input, response, quality, intent=None, user_id=None):
         user_id (str, optional): User identifier
         
     Returns:
-        bool: Success status
+        bool: True if the feedback was queued for storage (False only for an invalid quality)
     """
     if quality not in ['good', 'bad', 'neutral']:
         logger.error(f"Invalid quality value: {quality}. Use 'good', 'bad', or 'neutral'.")
@@ -48,38 +239,22 @@ def store_feedback(user_input, response, quality, intent=None, user_id=None):
         "quality": quality,
         "intent": intent,
         "user_id": user_id,
-        "timestamp": datetime.datetime.now().isoformat()
+        "ts_ns": time.time_ns()
     }
     
     # Determine target file based on quality
     if quality == 'good':
-        target_file = APPROVED_FILE
+        target_path = APPROVED_PATH
     elif quality == 'bad':
-        target_file = REJECTED_FILE
+        target_path = REJECTED_PATH
     else:
         # For neutral feedback, we don't store it for now
         return True
     
-    try:
-        # Load existing entries if file exists
-        entries = []
-        if os.path.exists(target_file):
-            with open(target_file, 'r', encoding='utf-8') as f:
-                entries = json.load(f)
-        
-        # Add new entry
-        entries.append(feedback_entry)
-        
-        # Save updated entries
-        with open(target_file, 'w', encoding='utf-8') as f:
-            json.dump(entries, f, indent=2, ensure_ascii=False)
-            
-        logger.info(f"Stored {quality} feedback for: '{user_input}'")
-        return True
-    
-    except Exception as e:
-        logger.error(f"Error storing feedback: {e}")
-        return False
+    _ensure_writer()
+    _feedback_queue.put((target_path, feedback_entry))
+    logger.info(f"Queued {quality} feedback for: '{user_input}'")
+    return True
 
 def analyze_and_incorporate_feedback(min_approval_count=3):
     """
@@ -100,24 +275,33 @@ def analyze_and_incorporate_feedback(min_approval_count=3):
     }
     
     try:
-        # Load existing training data
-        training_data = []
-        if os.path.exists(TRAINING_DATA_FILE):
-            with open(TRAINING_DATA_FILE, 'r', encoding='utf-8') as f:
-                training_data = json.load(f)
-                stats["existing_count"] = len(training_data)
+        # Make sure recently submitted feedback is included
+        flush_feedback()
+        
+        # Load the dedup set from the persisted index when it is up to date,
+        # deferring the full training data parse until we need to append
+        training_data = None
+        index = _load_training_index()
+        if index is None:
+            training_data = _load_training_data()
+            existing_texts = {entry.get("text", "").lower().strip() for entry in training_data}
+            stats["existing_count"] = len(training_data)
+            if TRAINING_DATA_PATH.exists():
+                _save_training_index(existing_texts, len(training_data))
+        else:
+            existing_texts, stats["existing_count"] = index
         
         # Load approved feedback
         approved_examples = []
-        if os.path.exists(APPROVED_FILE):
-            with open(APPROVED_FILE, 'r', encoding='utf-8') as f:
+        if APPROVED_PATH.exists():
+            with APPROVED_PATH.open('r', encoding='utf-8') as f:
                 approved_examples = json.load(f)
                 stats["approved_examples"] = len(approved_examples)
         
         # Load rejected feedback for analysis (not used in this version)
         rejected_examples = []
-        if os.path.exists(REJECTED_FILE):
-            with open(REJECTED_FILE, 'r', encoding='utf-8') as f:
+        if REJECTED_PATH.exists():
+            with REJECTED_PATH.open('r', encoding='utf-8') as f:
                 rejected_examples = json.load(f)
                 stats["rejected_examples"] = len(rejected_examples)
         
@@ -136,37 +320,37 @@ def analyze_and_incorporate_feedback(min_approval_count=3):
             
             grouped_examples[user_input]["count"] += 1
             
-        # Find examples with sufficient approval count
+        # Find examples with sufficient approval count that aren't in the training data yet
+        new_examples = []
         for user_input, data in grouped_examples.items():
-            if data["count"] >= min_approval_count:
-                # Check if this example already exists in training data
-                exists = False
-                for entry in training_data:
-                    if entry.get("text", "").lower().strip() == user_input:
-                        exists = True
-                        break
-                
-                # If it doesn't exist, add it
-                if not exists:
-                    training_data.append({
-                        "text": user_input,
-                        "intent": data["intent"]
-                    })
-                    stats["new_added"] += 1
+            if data["count"] >= min_approval_count and user_input not in existing_texts:
+                new_examples.append({
+                    "text": user_input,
+                    "intent": data["intent"]
+                })
+                existing_texts.add(user_input)
+        
+        stats["new_added"] = len(new_examples)
         
         # Save updated training data if changes were made
-        if stats["new_added"] > 0:
+        if new_examples:
+            if training_data is None:
+                training_data = _load_training_data()
+            training_data.extend(new_examples)
+            
             # Create backup of existing training data
-            if os.path.exists(TRAINING_DATA_FILE):
-                backup_file = f"{TRAINING_DATA_FILE}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
-                with open(TRAINING_DATA_FILE, 'r', encoding='utf-8') as src, open(backup_file, 'w', encoding='utf-8') as dst:
-                    dst.write(src.read())
-                    logger.info(f"Created backup of training data: {backup_file}")
+            if TRAINING_DATA_PATH.exists():
+                # Backups are only read on manual restore, so store them compressed
+                backup_file = f"{TRAINING_DATA_FILE}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}.gz"
+                with TRAINING_DATA_PATH.open('rb') as src, gzip.open(backup_file, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+                logger.info(f"Created backup of training data: {backup_file}")
             
             # Save updated training data
-            with open(TRAINING_DATA_FILE, 'w', encoding='utf-8') as f:
+            with TRAINING_DATA_PATH.open('w', encoding='utf-8') as f:
                 json.dump(training_data, f, indent=2, ensure_ascii=False)
-                
+            _save_training_index(existing_texts, len(training_data))
+            
             logger.info(f"Added {stats['new_added']} new examples to training data")
         else:
             logger.info("No new examples added to training data")
@@ -193,58 +377,52 @@ def clean_up_feedback_files(max_age_days=30):
     }
     
     try:
-        now = datetime.datetime.now()
-        cutoff_date = now - datetime.timedelta(days=max_age_days)
+        cutoff_ns = time.time_ns() - max_age_days * 86400 * 10**9
         
-        # Process approved examples
-        if os.path.exists(APPROVED_FILE):
-            approved_examples = []
-            with open(APPROVED_FILE, 'r', encoding='utf-8') as f:
-                approved_examples = json.load(f)
+        # Write out queued feedback first, then hold the lock while rewriting
+        flush_feedback()
+        with _file_lock:
+            # Process approved examples
+            if APPROVED_PATH.exists():
+                approved_examples = []
+                with APPROVED_PATH.open('r', encoding='utf-8') as f:
+                    approved_examples = json.load(f)
             
-            # Filter out old entries
-            new_approved = []
-            for entry in approved_examples:
-                try:
-                    entry_date = datetime.datetime.fromisoformat(entry["timestamp"])
-                    if entry_date >= cutoff_date:
+                # Filter out old entries
+                new_approved = []
+                for entry in approved_examples:
+                    ts_ns = _entry_ts_ns(entry)
+                    # Keep entries with invalid timestamps for now
+                    if ts_ns is None or ts_ns >= cutoff_ns:
                         new_approved.append(entry)
                     else:
                         stats["approved_cleaned"] += 1
-                except (ValueError, KeyError):
-                    # Keep entries with invalid timestamps for now
-                    new_approved.append(entry)
             
-            # Save updated list
-            if stats["approved_cleaned"] > 0:
-                with open(APPROVED_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(new_approved, f, indent=2, ensure_ascii=False)
-                logger.info(f"Removed {stats['approved_cleaned']} old approved examples")
+                # Save updated list
+                if stats["approved_cleaned"] > 0:
+                    _write_feedback_file(APPROVED_PATH, new_approved)
+                    logger.info(f"Removed {stats['approved_cleaned']} old approved examples")
         
-        # Process rejected examples
-        if os.path.exists(REJECTED_FILE):
-            rejected_examples = []
-            with open(REJECTED_FILE, 'r', encoding='utf-8') as f:
-                rejected_examples = json.load(f)
+            # Process rejected examples
+            if REJECTED_PATH.exists():
+                rejected_examples = []
+                with REJECTED_PATH.open('r', encoding='utf-8') as f:
+                    rejected_examples = json.load(f)
             
-            # Filter out old entries
-            new_rejected = []
-            for entry in rejected_examples:
-                try:
-                    entry_date = datetime.datetime.fromisoformat(entry["timestamp"])
-                    if entry_date >= cutoff_date:
+                # Filter out old entries
+                new_rejected = []
+                for entry in rejected_examples:
+                    ts_ns = _entry_ts_ns(entry)
+                    # Keep entries with invalid timestamps for now
+                    if ts_ns is None or ts_ns >= cutoff_ns:
                         new_rejected.append(entry)
                     else:
                         stats["rejected_cleaned"] += 1
-                except (ValueError, KeyError):
-                    # Keep entries with invalid timestamps for now
-                    new_rejected.append(entry)
             
-            # Save updated list
-            if stats["rejected_cleaned"] > 0:
-                with open(REJECTED_FILE, 'w', encoding='utf-8') as f:
-                    json.dump(new_rejected, f, indent=2, ensure_ascii=False)
-                logger.info(f"Removed {stats['rejected_cleaned']} old rejected examples")
+                # Save updated list
+                if stats["rejected_cleaned"] > 0:
+                    _write_feedback_file(REJECTED_PATH, new_rejected)
+                    logger.info(f"Removed {stats['rejected_cleaned']} old rejected examples")
         
         return stats
     
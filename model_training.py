@@ -7,16 +7,41 @@ import json
 import logging
 import datetime
 import argparse
+import bisect
 import numpy as np
+from collections import Counter
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from sklearn.metrics import classification_report, confusion_matrix
 
-# Set up logging
+# orjson is optional; it parses and serializes the metrics files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional; it streams training examples instead of loading the whole file
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# numba is optional; it compiles the per-intent error aggregation to native code
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Set up logging; file records are buffered and written in batches (flushed
+# immediately on ERROR and at interpreter shutdown)
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler("model_training.log", delay=True)
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler("model_training.log"),
+        MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=_file_handler),
         logging.StreamHandler()
     ]
 )
@@ -27,12 +52,125 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(SCRIPT_DIR, "data")
 MODEL_DIR = os.path.join(DATA_DIR, "models")
 TRAINING_DATA_PATH = os.path.join(DATA_DIR, "intent_training_data.json")
+# Append-only history (one JSON object per line) and its on-demand compacted snapshot
+METRICS_LOG_FILE = os.path.join(DATA_DIR, "training_metrics.jsonl")
 METRICS_FILE = os.path.join(DATA_DIR, "training_metrics.json")
+# Pointer to the most accurate saved model: "<accuracy>\t<model_path>"
+BEST_MODEL_FILE = os.path.join(DATA_DIR, "best_model.txt")
 
 # Create directories if they don't exist
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
 
+# Import the ML engine once; the training and analysis functions check for None
+if SCRIPT_DIR not in sys.path:
+    sys.path.append(SCRIPT_DIR)
+try:
+    from chatbot.ml_engine import intent_classifier
+except ImportError as e:
+    logger.error(f"Could not import ML engine: {e}")
+    intent_classifier = None
+
+def _load_json(path):
+    """Load a JSON file, using orjson when it is available"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _iter_json_items(path):
+    """Yield the items of a JSON array file one at a time, streaming with ijson if available"""
+    if ijson is not None:
+        with open(path, 'rb') as f:
+            yield from ijson.items(f, 'item')
+    else:
+        yield from _load_json(path)
+
+# Errors raised for malformed JSON by whichever parser is in use
+_JSON_ERRORS = (json.JSONDecodeError, ijson.JSONError) if ijson is not None else (json.JSONDecodeError,)
+
+def _dump_json(obj, path, pretty=False):
+    """Write an object as JSON (compact unless pretty), using orjson when it is available"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=option))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            if pretty:
+                json.dump(obj, f, indent=2, ensure_ascii=False)
+            else:
+                json.dump(obj, f, separators=(",", ":"), ensure_ascii=False)
+
+def _dumps_line(obj):
+    """Serialize an object as a single JSON line (bytes, newline-terminated)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) + b"\n"
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8') + b"\n"
+
+def _loads(data):
+    """Parse JSON from bytes, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _migrate_legacy_metrics():
+    """Seed the append-only history from a legacy training_metrics.json array"""
+    if os.path.exists(METRICS_LOG_FILE) or not os.path.exists(METRICS_FILE):
+        return
+    
+    legacy_history = _load_json(METRICS_FILE)
+    with open(METRICS_LOG_FILE, 'wb') as f:
+        for metrics in legacy_history:
+            f.write(_dumps_line(metrics))
+    logger.info(f"Migrated {len(legacy_history)} metrics entries to {METRICS_LOG_FILE}")
+
+def iter_metrics_history():
+    """
+    Iterate over the training metrics history, oldest first
+    
+    Yields:
+        dict: One metrics entry per training run
+    """
+    _migrate_legacy_metrics()
+    if not os.path.exists(METRICS_LOG_FILE):
+        return
+    
+    with open(METRICS_LOG_FILE, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _loads(line)
+
+def _shrink(d, ndigits=4):
+    """Recursively round the floats in a (classification report) dict to keep stored metrics compact"""
+    return {
+        k: round(v, ndigits) if isinstance(v, float)
+        else _shrink(v, ndigits) if isinstance(v, dict)
+        else v
+        for k, v in d.items()
+    }
+
+if njit is not None:
+    @njit(cache=True)
+    def _count_intent_errors(inverse, wrong, n_labels):
+        """Per-intent totals and error counts for encoded intent labels"""
+        totals = np.zeros(n_labels, np.int64)
+        errors = np.zeros(n_labels, np.int64)
+        for i in range(inverse.size):
+            totals[inverse[i]] += 1
+            errors[inverse[i]] += wrong[i]
+        return totals, errors
+else:
+    def _count_intent_errors(inverse, wrong, n_labels):
+        """Per-intent totals and error counts for encoded intent labels"""
+        totals = np.bincount(inverse, minlength=n_labels)
+        errors = np.bincount(inverse, weights=wrong, minlength=n_labels).astype(np.int64)
+        return totals, errors
+
 def train_and_evaluate_model(data_path=None, test_size=0.2, save_model=True, version_suffix=None):
     """
     Train and evaluate an intent classification model
@@ -47,9 +185,8 @@ def train_and_evaluate_model(data_path=None, test_size=0.2, save_model=True, ver
         dict: Training results and evaluation metrics
     """
     try:
-        # Import ML engine
-        sys.path.append(SCRIPT_DIR)
-        from chatbot.ml_engine import intent_classifier
+        if intent_classifier is None:
+            return {"error": "ML engine is not available"}
         
         # Set default data path if not specified
         if data_path is None:
@@ -61,29 +198,24 @@ def train_and_evaluate_model(data_path=None, test_size=0.2, save_model=True, ver
         
         # Load training data to get counts
         try:
-            with open(data_path, 'r', encoding='utf-8') as f:
-                training_data = json.load(f)
-            
-            # Count examples per intent
-            intent_counts = {}
-            for item in training_data:
-                intent = item.get("intent")
-                if intent:
-                    intent_counts[intent] = intent_counts.get(intent, 0) + 1
+            # Count examples per intent in a single streaming pass (only the labels are kept)
+            intents = [item.get("intent") for item in _iter_json_items(data_path)]
+            num_examples = len(intents)
+            intent_counts = dict(Counter(filter(None, intents)))
             
-            logger.info(f"Loaded {len(training_data)} training examples")
+            logger.info(f"Loaded {num_examples} training examples")
             logger.info(f"Intent distribution: {intent_counts}")
             
             # Check if we have enough examples
-            if len(training_data) < 10:
-                logger.warning(f"Very small training dataset ({len(training_data)} examples). Results may be unreliable.")
+            if num_examples < 10:
+                logger.warning(f"Very small training dataset ({num_examples} examples). Results may be unreliable.")
             
             # Check if any intent has too few examples
             for intent, count in intent_counts.items():
                 if count < 5:
                     logger.warning(f"Intent '{intent}' has only {count} examples. Consider adding more.")
             
-        except json.JSONDecodeError as e:
+        except _JSON_ERRORS as e:
             logger.error(f"Error parsing training data: {e}")
             return {"error": f"Invalid training data format: {e}"}
         except Exception as e:
@@ -111,11 +243,11 @@ def train_and_evaluate_model(data_path=None, test_size=0.2, save_model=True, ver
         metrics = {
             "timestamp": datetime.datetime.now().isoformat(),
             "accuracy": accuracy,
-            "training_examples": len(training_data),
+            "training_examples": num_examples,
             "intent_distribution": intent_counts,
             "training_duration": train_duration,
             "best_params": training_results.get("best_params", {}),
-            "report": training_results.get("report", {})
+            "report": _shrink(training_results.get("report", {}))
         }
         
         # Save the model with version info if requested
@@ -150,6 +282,73 @@ def train_and_evaluate_model(data_path=None, test_size=0.2, save_model=True, ver
         logger.error(f"Unexpected error in training: {e}")
         return {"error": f"Unexpected error: {e}"}
 
+def _load_metrics_history():
+    """
+    Load the metrics history sorted by timestamp
+    
+    Runs are appended in time order, so entries are normally just appended;
+    the rare out-of-order entry is placed with a binary search instead of
+    re-sorting the whole list.
+    
+    Returns:
+        list: Metrics entries, oldest first
+    """
+    metrics_history = []
+    timestamps = []  # Sort keys aligned with metrics_history (bisect has no key= before 3.10)
+    
+    for metrics in iter_metrics_history():
+        ts = metrics.get("timestamp", "")
+        if timestamps and ts < timestamps[-1]:
+            idx = bisect.bisect_right(timestamps, ts)
+            timestamps.insert(idx, ts)
+            metrics_history.insert(idx, metrics)
+        else:
+            timestamps.append(ts)
+            metrics_history.append(metrics)
+    
+    return metrics_history
+
+def _read_best_model():
+    """
+    Read the best-model pointer file
+    
+    Returns:
+        tuple: (accuracy, model_path), or (None, None) if no pointer exists
+    """
+    try:
+        with open(BEST_MODEL_FILE, 'r', encoding='utf-8') as f:
+            accuracy, model_path = f.readline().rstrip("\n").split("\t", 1)
+        return float(accuracy), model_path
+    except (OSError, ValueError):
+        return None, None
+
+def _update_best_model(metrics):
+    """Atomically repoint best_model.txt if this run's saved model is more accurate"""
+    model_path = metrics.get("model_path")
+    accuracy = metrics.get("accuracy")
+    if not model_path or accuracy is None:
+        return
+    
+    best_accuracy, _ = _read_best_model()
+    if best_accuracy is not None and accuracy <= best_accuracy:
+        return
+    
+    tmp_path = BEST_MODEL_FILE + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f"{accuracy!r}\t{model_path}\n")
+    os.replace(tmp_path, BEST_MODEL_FILE)
+    logger.info(f"New best model ({accuracy:.4f}): {model_path}")
+
+def _get_best_model_path():
+    """Return the path of the most accurate saved model, or None"""
+    _, model_path = _read_best_model()
+    if model_path is None and (os.path.exists(METRICS_LOG_FILE) or os.path.exists(METRICS_FILE)):
+        # No pointer yet (history predates it); scan the history once and seed it
+        best_model = analyze_training_trends().get("best_model", {})
+        _update_best_model(best_model)
+        model_path = best_model.get("model_path")
+    return model_path
+
 def update_metrics_history(new_metrics):
     """
     Update the metrics history file with new training results
@@ -161,29 +360,40 @@ def update_metrics_history(new_metrics):
         bool: Success status
     """
     try:
-        # Load existing metrics if file exists
-        metrics_history = []
-        if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, 'r', encoding='utf-8') as f:
-                metrics_history = json.load(f)
+        _migrate_legacy_metrics()
         
-        # Add new metrics
-        metrics_history.append(new_metrics)
+        # Append a single line; the existing history is never re-read or rewritten
+        with open(METRICS_LOG_FILE, 'ab') as f:
+            f.write(_dumps_line(new_metrics))
         
-        # Sort by timestamp
-        metrics_history.sort(key=lambda x: x.get("timestamp", ""))
+        _update_best_model(new_metrics)
         
-        # Save updated metrics
-        with open(METRICS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(metrics_history, f, indent=2, ensure_ascii=False)
-            
-        logger.info(f"Updated metrics history ({len(metrics_history)} entries)")
+        logger.info("Appended training run to metrics history")
         return True
         
     except Exception as e:
         logger.error(f"Error updating metrics history: {e}")
         return False
 
+def compact_metrics_history(pretty=False):
+    """
+    Write the full metrics history to training_metrics.json as a single JSON array
+    
+    Args:
+        pretty (bool): Indent the output for human reading
+        
+    Returns:
+        int: Number of entries written, or -1 on failure
+    """
+    try:
+        metrics_history = _load_metrics_history()
+        _dump_json(metrics_history, METRICS_FILE, pretty=pretty)
+        logger.info(f"Wrote compacted metrics snapshot ({len(metrics_history)} entries) to {METRICS_FILE}")
+        return len(metrics_history)
+    except Exception as e:
+        logger.error(f"Error compacting metrics history: {e}")
+        return -1
+
 def analyze_training_trends():
     """
     Analyze training metrics history for trends
@@ -192,45 +402,33 @@ def analyze_training_trends():
         dict: Analysis results
     """
     try:
-        if not os.path.exists(METRICS_FILE):
+        # Load metrics history (already sorted by timestamp)
+        metrics_history = _load_metrics_history()
+        
+        if not os.path.exists(METRICS_LOG_FILE):
             logger.warning("No metrics history found")
             return {"error": "No metrics history found"}
         
-        # Load metrics history
-        with open(METRICS_FILE, 'r', encoding='utf-8') as f:
-            metrics_history = json.load(f)
-        
         if not metrics_history:
             return {"error": "Metrics history is empty"}
         
-        # Sort by timestamp
-        metrics_history.sort(key=lambda x: x.get("timestamp", ""))
-        
         # Extract key metrics
-        timestamps = []
         accuracies = []
         train_durations = []
         example_counts = []
         intent_counts = []
         
+        all_intents = set()  # Intents seen across all models
+        
         for metrics in metrics_history:
-            try:
-                # Parse timestamp
-                ts = datetime.datetime.fromisoformat(metrics.get("timestamp", ""))
-                timestamps.append(ts)
-                
-                # Get other metrics
-                accuracies.append(metrics.get("accuracy", 0))
-                train_durations.append(metrics.get("training_duration", 0))
-                example_counts.append(metrics.get("training_examples", 0))
-                
-                # Count intents
-                intent_distribution = metrics.get("intent_distribution", {})
-                intent_counts.append(len(intent_distribution))
-                
-            except (ValueError, TypeError) as e:
-                logger.warning(f"Skipping invalid metrics entry: {e}")
-                continue
+            accuracies.append(metrics.get("accuracy", 0))
+            train_durations.append(metrics.get("training_duration", 0))
+            example_counts.append(metrics.get("training_examples", 0))
+            
+            # Count intents
+            intent_distribution = metrics.get("intent_distribution", {})
+            intent_counts.append(len(intent_distribution))
+            all_intents.update(intent_distribution.keys())
         
         # Calculate trends
         accuracy_trend = None
@@ -240,25 +438,21 @@ def analyze_training_trends():
             accuracy_trend = "improving" if accuracies[-1] > accuracies[0] else "declining"
             example_trend = "growing" if example_counts[-1] > example_counts[0] else "shrinking"
         
-        # Find best and worst models
-        best_idx = accuracies.index(max(accuracies)) if accuracies else None
-        worst_idx = accuracies.index(min(accuracies)) if accuracies else None
+        # Find best and worst models in one vectorized pass each
+        acc_arr = np.asarray(accuracies, dtype=np.float64)
+        best_idx = int(np.argmax(acc_arr)) if acc_arr.size else None
+        worst_idx = int(np.argmin(acc_arr)) if acc_arr.size else None
+        average_accuracy = float(acc_arr.mean()) if acc_arr.size else 0
         
         best_model = metrics_history[best_idx] if best_idx is not None else None
         worst_model = metrics_history[worst_idx] if worst_idx is not None else None
         
-        # Most common intents across all models
-        all_intents = set()
-        for metrics in metrics_history:
-            intent_distribution = metrics.get("intent_distribution", {})
-            all_intents.update(intent_distribution.keys())
-        
         # Prepare analysis
         analysis = {
             "total_training_runs": len(metrics_history),
-            "first_training": timestamps[0].isoformat() if timestamps else None,
-            "latest_training": timestamps[-1].isoformat() if timestamps else None,
-            "average_accuracy": sum(accuracies) / len(accuracies) if accuracies else 0,
+            "first_training": metrics_history[0].get("timestamp"),
+            "latest_training": metrics_history[-1].get("timestamp"),
+            "average_accuracy": average_accuracy,
             "accuracy_trend": accuracy_trend,
             "training_examples_trend": example_trend,
             "best_model": {
@@ -293,9 +487,8 @@ def analyze_model_errors(data_path=None, best_model=True):
         dict: Error analysis results
     """
     try:
-        # Import ML engine components
-        sys.path.append(SCRIPT_DIR)
-        from chatbot.ml_engine import intent_classifier
+        if intent_classifier is None:
+            return {"error": "ML engine is not available"}
         
         # Load data
         if data_path is None:
@@ -304,13 +497,9 @@ def analyze_model_errors(data_path=None, best_model=True):
         if not os.path.exists(data_path):
             return {"error": f"Data not found at {data_path}"}
         
-        with open(data_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        
         # If using best model, find and load it
         if best_model:
-            analysis = analyze_training_trends()
-            best_model_path = analysis.get("best_model", {}).get("model_path")
+            best_model_path = _get_best_model_path()
             
             if best_model_path and os.path.exists(best_model_path):
                 logger.info(f"Loading best model from {best_model_path}")
@@ -318,11 +507,11 @@ def analyze_model_errors(data_path=None, best_model=True):
             else:
                 logger.warning("Best model not found, using current model")
         
-        # Prepare data for evaluation
+        # Prepare data for evaluation, streaming items from the data file
         texts = []
         true_intents = []
         
-        for item in data:
+        for item in _iter_json_items(data_path):
             text = item.get("text")
             intent = item.get("intent")
             
@@ -330,103 +519,84 @@ def analyze_model_errors(data_path=None, best_model=True):
                 texts.append(text)
                 true_intents.append(intent)
         
-        # Make predictions
-        predictions = []
-        confidences = []
-        
-        for text in texts:
-            result = intent_classifier.predict(text)
-            predictions.append(result.get("intent"))
-            confidences.append(result.get("confidence", 0))
-        
-        # Calculate confusion matrix and classification report
-        from sklearn.metrics import confusion_matrix, classification_report
+        # Make predictions for all texts in one batch
+        # predictions is an object array (None below threshold); float32 halves the confidence buffer
+        predictions, confidences = intent_classifier.predict_batch(texts)
+        confidences = confidences.astype(np.float32, copy=False)
         
         # Filter out None predictions
-        valid_indices = [i for i, pred in enumerate(predictions) if pred is not None]
+        valid = predictions != None  # noqa: E711 - elementwise comparison on an object array
         
-        if not valid_indices:
+        if not valid.any():
             return {"error": "No valid predictions made"}
         
-        filtered_true = [true_intents[i] for i in valid_indices]
-        filtered_pred = [predictions[i] for i in valid_indices]
+        true_arr = np.asarray(true_intents, dtype=object)
+        filtered_true = true_arr[valid]
+        filtered_pred = predictions[valid]
         
         # Generate classification report
         report = classification_report(filtered_true, filtered_pred, output_dict=True)
         
-        # Find the most confused intent pairs
-        cm = confusion_matrix(filtered_true, filtered_pred, labels=sorted(set(filtered_true)))
-        
         # Get unique labels
         labels = sorted(set(filtered_true))
         
-        # Find where the model is most confused
-        confusion_pairs = []
-        
-        for i in range(len(labels)):
-            for j in range(len(labels)):
-                if i != j and cm[i, j] > 0:
-                    confusion_pairs.append({
-                        "true": labels[i],
-                        "predicted": labels[j],
-                        "count": int(cm[i, j])
-                    })
-        
-        # Sort by count in descending order
-        confusion_pairs.sort(key=lambda x: x["count"], reverse=True)
-        
-        # Find examples with lowest confidence
-        low_confidence = []
-        
-        for i, text in enumerate(texts):
-            pred = predictions[i]
-            conf = confidences[i]
-            true = true_intents[i]
-            
-            if pred is not None and conf < 0.7:  # Threshold for "low confidence"
-                low_confidence.append({
-                    "text": text,
-                    "true_intent": true,
-                    "predicted_intent": pred,
-                    "confidence": conf,
-                    "correct": pred == true
-                })
-        
-        # Sort by confidence in ascending order
-        low_confidence.sort(key=lambda x: x["confidence"])
-        
-        # Find intents with highest error rates
-        intent_errors = {}
-        for i, intent in enumerate(true_intents):
-            if intent not in intent_errors:
-                intent_errors[intent] = {"total": 0, "errors": 0}
-            
-            intent_errors[intent]["total"] += 1
-            
-            if predictions[i] != intent:
-                intent_errors[intent]["errors"] += 1
-        
-        # Calculate error rates
-        intent_error_rates = []
-        for intent, counts in intent_errors.items():
-            if counts["total"] > 0:
-                error_rate = counts["errors"] / counts["total"]
-                intent_error_rates.append({
-                    "intent": intent,
-                    "error_rate": error_rate,
-                    "total": counts["total"],
-                    "errors": counts["errors"]
-                })
-        
-        # Sort by error rate in descending order
-        intent_error_rates.sort(key=lambda x: x["error_rate"], reverse=True)
+        # Find the most confused intent pairs
+        cm = confusion_matrix(filtered_true, filtered_pred, labels=labels)
+        
+        # Find where the model is most confused (off-diagonal, non-zero cells)
+        mask = ~np.eye(len(labels), dtype=bool) & (cm > 0)
+        rows, cols = np.nonzero(mask)
+        counts = cm[rows, cols]
+        
+        # Keep the top 5 by count in descending order (stable for equal counts)
+        order = np.argsort(-counts, kind="stable")[:5]
+        confusion_pairs = [
+            {
+                "true": labels[rows[k]],
+                "predicted": labels[cols[k]],
+                "count": int(counts[k])
+            }
+            for k in order
+        ]
+        
+        # Find the 10 valid predictions with lowest confidence (ascending)
+        low_mask = valid & (confidences < 0.7)  # Threshold for "low confidence"
+        low_idx = np.flatnonzero(low_mask)
+        low_idx = low_idx[np.argsort(confidences[low_idx], kind="stable")[:10]]
+        low_confidence = [
+            {
+                "text": texts[i],
+                "true_intent": true_intents[i],
+                "predicted_intent": predictions[i],
+                "confidence": float(confidences[i]),
+                "correct": bool(predictions[i] == true_intents[i])
+            }
+            for i in low_idx
+        ]
+        
+        # Find intents with highest error rates (None predictions count as errors)
+        intent_labels, inverse = np.unique(true_arr, return_inverse=True)
+        wrong = (predictions != true_arr).astype(np.int64)
+        totals, errors = _count_intent_errors(inverse.astype(np.int64), wrong, len(intent_labels))
+        rates = errors / np.maximum(totals, 1)
+        
+        # Keep the top 5 by error rate in descending order
+        intent_error_rates = [
+            {
+                "intent": intent_labels[k],
+                "error_rate": float(rates[k]),
+                "total": int(totals[k]),
+                "errors": int(errors[k])
+            }
+            for k in np.argsort(-rates, kind="stable")[:5]
+        ]
         
         # Prepare results
         results = {
             "overall_accuracy": report.get("accuracy", 0),
-            "intent_error_rates": intent_error_rates[:5],  # Top 5 intents with highest error rates
-            "confusion_pairs": confusion_pairs[:5],  # Top 5 confused intent pairs
-            "low_confidence_examples": low_confidence[:10],  # Top 10 examples with lowest confidence
+            "intent_error_rates": intent_error_rates,
+            "confusion_pairs": confusion_pairs,
+            "low_confidence_examples": low_confidence,  # Top 10 examples with lowest confidence
             "improvement_suggestions": []
         }
         
@@ -446,7 +616,7 @@ def analyze_model_errors(data_path=None, best_model=True):
                     f"Clarify distinction between intents '{true_intent}' and '{pred_intent}'"
                 )
         
-        if low_confidence_examples:
+        if low_confidence:
             results["improvement_suggestions"].append(
                 "Add more diverse examples for the intents with lowest confidence predictions"
             )
@@ -499,6 +669,18 @@ def main():
         help="Use the best model for error analysis instead of current"
     )
     
+    parser.add_argument(
+        "--compact", 
+        action="store_true",
+        help="Write the metrics history to training_metrics.json as a single JSON array"
+    )
+    
+    parser.add_argument(
+        "--pretty", 
+        action="store_true",
+        help="Indent the --compact snapshot (or view it with: python -m json.tool data/training_metrics.json)"
+    )
+    
     args = parser.parse_args()
     
     if args.action == "train" or args.action == "all":
@@ -556,6 +738,9 @@ def main():
             for pair in error_analysis.get("confusion_pairs", [])[:3]:
                 logger.info(f"  - {pair['true']} confused with {pair['predicted']} ({pair['count']} times)")
     
+    if args.compact:
+        compact_metrics_history(pretty=args.pretty)
+    
     logger.info("Script execution complete")
 
 if __name__ == "__main__":
@@ -2,13 +2,45 @@
 # Web dashboard for monitoring chatbot performance
 
 import os
+import re
+import gzip
 import json
 import logging
 import datetime
-import pandas as pd
-import numpy as np
+import hashlib
+import heapq
+import statistics
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, g, jsonify, request
+
+# orjson is optional; it encodes API responses several times faster than jsonify
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ijson is optional; it streams the legacy metrics array instead of loading it whole
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Flask-Compress is optional; it gzip/brotli-encodes the JSON API responses
+try:
+    from flask_compress import Compress
+except ImportError:
+    Compress = None
+
+# Flask-Caching is optional; without it the API views are simply not memoized
+try:
+    from flask_caching import Cache
+except ImportError:
+    Cache = None
 
 # Set up logging
 logging.basicConfig(
@@ -19,1142 +51,984 @@ logger = logging.getLogger("monitoring")
 
 # Path constants
 DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+DASHBOARD_PAGE = os.path.join(TEMPLATE_DIR, "dashboard.html")
+METRICS_LOG_FILE = os.path.join(DATA_DIR, "training_metrics.jsonl")
 METRICS_FILE = os.path.join(DATA_DIR, "training_metrics.json")
 FEEDBACK_DIR = os.path.join(DATA_DIR, "feedback")
 APPROVED_FILE = os.path.join(FEEDBACK_DIR, "approved_examples.json")
 REJECTED_FILE = os.path.join(FEEDBACK_DIR, "rejected_examples.json")
+# Precomputed feedback aggregates, valid while the source files' mtimes match
+FEEDBACK_AGG_FILE = os.path.join(FEEDBACK_DIR, "_agg.json")
 LOG_FILE = "chatbot.log"
 
+# User-generated text is stripped of control characters and shortened to
+# this many characters before it is sent to the dashboard
+CONTROL_CHARS_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+MAX_DISPLAY_TEXT = 500
+
+# Longer series are downsampled before charting; more points than this only
+# overlap on screen
+MAX_CHART_POINTS = 500
+
+# Each /api/stream response holds a server thread, so it ends after
+# STREAM_MAX_SECONDS; the browser's EventSource reconnects after STREAM_RETRY_MS
+# and resumes from the last entry it received
+STREAM_MAX_SECONDS = 300
+STREAM_RETRY_MS = 2000
+
+# "<asctime> - <name> - <levelname> - <message>", the format used by every logger in the project
+LOG_RE = re.compile(r'^(?P<timestamp>[^ ]+ [^ ]+) - (?P<module>[^ ]+) - (?P<level>[^ ]+) - (?P<message>.*)$')
+
 # Create Flask app
 app = Flask(__name__)
 
+if Compress is not None:
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_LEVEL'] = 4  # Favour speed over ratio for frequent polls
+    Compress(app)
+else:
+    @app.after_request
+    def _gzip_json(response):
+        """Gzip larger JSON responses for clients that accept it (Flask-Compress fallback)"""
+        if (response.status_code != 200 or response.direct_passthrough
+                or response.mimetype != 'application/json'
+                or 'Content-Encoding' in response.headers
+                or 'gzip' not in request.headers.get('Accept-Encoding', '')):
+            return response
+        
+        body = response.get_data()
+        if len(body) < 500:
+            return response
+        
+        response.set_data(gzip.compress(body, compresslevel=4))
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+# Cache /api/* payloads for a short TTL. Any write endpoint added later must
+# invalidate the affected view, e.g. cache.delete('view//api/feedback').
+API_CACHE_TIMEOUT = 30
+LOG_CACHE_TIMEOUT = 5
+
+if Cache is not None:
+    cache = Cache(app, config={
+        'CACHE_TYPE': 'SimpleCache',
+        'CACHE_DEFAULT_TIMEOUT': API_CACHE_TIMEOUT
+    })
+    cached = cache.cached
+else:
+    cache = None
+    
+    def cached(timeout=None, **kwargs):
+        """No-op stand-in for cache.cached when Flask-Caching is not installed"""
+        return lambda view: view
+
+# orjson options for every API payload
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson is not None else 0
+
+def _dumps(obj):
+    """Serialize obj to compact JSON bytes with orjson, falling back to json"""
+    if orjson is None:
+        return json.dumps(obj, separators=(",", ":")).encode('utf-8')
+    return orjson.dumps(obj, option=ORJSON_OPTIONS)
+
+def ojsonify(obj):
+    """Serialize obj to a JSON response with orjson, falling back to flask.jsonify"""
+    if orjson is None:
+        return jsonify(obj)
+    return app.response_class(_dumps(obj), mimetype='application/json')
+
+def _file_etag(*paths):
+    """Build an ETag from the mtime and size of the files backing a response"""
+    parts = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            parts.append(f"{st.st_mtime_ns}-{st.st_size}")
+        except FileNotFoundError:
+            parts.append("missing")
+    return hashlib.blake2b("|".join(parts).encode(), digest_size=8).hexdigest()
+
+def _is_conditional_request():
+    """Conditional requests bypass the view cache so they can be answered with a 304"""
+    return "If-None-Match" in request.headers
+
+def _conditional_json(etag, build):
+    """Return 304 if the client already has this ETag, otherwise the JSON built by build()"""
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    else:
+        response = ojsonify(build())
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.after_request
+def _etag_json(response):
+    """
+    Give JSON responses without a file-based ETag one hashed from the body,
+    so the dashboard can revalidate any endpoint with If-None-Match
+
+    Registered after the gzip fallback, so it runs first and hashes the
+    uncompressed body.
+    """
+    if (request.method != 'GET' or response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'ETag' in response.headers):
+        return response
+    
+    etag = hashlib.blake2b(response.get_data(), digest_size=8).hexdigest()
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _display_ts(timestamp):
+    """Format an ISO or log-style timestamp as 'YYYY-MM-DD HH:MM:SS' for display"""
+    return timestamp[:19].replace("T", " ") if timestamp else None
+
+def _ndjson(rows):
+    """Stream rows as newline-delimited JSON, one object per line"""
+    def generate():
+        for row in rows:
+            yield _dumps(row) + b"\n"
+    return app.response_class(generate(), mimetype='application/x-ndjson')
+
+@lru_cache(maxsize=1024)
+def _clean_text(text):
+    """Strip control characters from user-generated text and cap its length for display"""
+    if not isinstance(text, str):
+        return text
+    text = CONTROL_CHARS_RE.sub("", text)
+    if len(text) > MAX_DISPLAY_TEXT:
+        text = text[:MAX_DISPLAY_TEXT - 1] + "\u2026"
+    return text
+
+def _for_display(entries):
+    """
+    Copy feedback entries with an ISO 'timestamp' (derived from 'ts_ns' when
+    that is all they store), a pre-formatted 'display_ts' and cleaned
+    user_input/response text
+    """
+    result = []
+    for entry in entries:
+        timestamp = entry.get("timestamp")
+        if timestamp is None and entry.get("ts_ns") is not None:
+            timestamp = datetime.datetime.fromtimestamp(entry["ts_ns"] / 1e9).isoformat()
+        result.append(dict(
+            entry,
+            timestamp=timestamp,
+            display_ts=_display_ts(timestamp),
+            user_input=_clean_text(entry.get("user_input")),
+            response=_clean_text(entry.get("response"))
+        ))
+    return result
+
+# Request counters for /api/server_stats: total handled and the durations
+# (seconds) of the most recent 100 requests
+_request_count = 0
+_request_durations = deque(maxlen=100)
+_request_stats_lock = threading.Lock()
+
+@app.before_request
+def _start_request_timer():
+    """Note when the request started"""
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def _record_request_duration(response):
+    """Count the request and remember how long it took"""
+    start = g.pop("request_start", None)
+    if start is not None:
+        global _request_count
+        with _request_stats_lock:
+            _request_count += 1
+            _request_durations.append(time.perf_counter() - start)
+    return response
+
+# Threads for loading independent data files in parallel
+_IO_POOL = ThreadPoolExecutor(max_workers=4)
+
+# Parsed JSON files keyed by path: path -> (st_mtime_ns, parsed object).
+# Cached objects are shared between requests and must not be mutated.
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+
+def _read_json_lines(f):
+    """Parse a JSON Lines file into a list"""
+    return [json.loads(line) for line in f if line.strip()]
+
+def _load_json_cached(path, default=None, reader=json.load):
+    """
+    Load a JSON file, reusing the parsed result while its mtime is unchanged
+    
+    Args:
+        path (str): File to load
+        default: Value returned when the file does not exist
+        reader (callable): Parses the open text file (JSON by default)
+        
+    Returns:
+        The parsed file contents, or default
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return default
+    
+    with _json_cache_lock:
+        cached = _json_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    # Parse outside the lock so independent files can be loaded concurrently
+    with open(path, 'r', encoding='utf-8') as f:
+        data = reader(f)
+    with _json_cache_lock:
+        _json_cache[path] = (mtime_ns, data)
+    return data
+
+def _load_metrics_history():
+    """Load training metrics from the JSONL history, falling back to the legacy JSON array"""
+    if os.path.exists(METRICS_LOG_FILE):
+        return _load_json_cached(METRICS_LOG_FILE, [], reader=_read_json_lines)
+    return _load_json_cached(METRICS_FILE, [])
+
+# Parsed log tail, reused while chatbot.log keeps the same size and mtime:
+# (st_size, st_mtime_ns, entries), replaced as a whole so readers never see a mix
+_log_cache = (-1, 0, [])
+
+def tail(path, n=200, blocksize=8192):
+    """
+    Return the last n lines of a text file without reading the whole file
+    
+    Args:
+        path (str): File to read
+        n (int): Number of lines to return
+        blocksize (int): Bytes read per backwards step
+        
+    Returns:
+        list: Up to n decoded lines, oldest first
+    """
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        
+        # Step backwards until the buffer holds more than n line breaks
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(blocksize, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    
+    return data.decode('utf-8', errors='replace').splitlines()[-n:]
+
+def last_metrics_entry():
+    """Return the most recent training metrics entry without loading the whole history"""
+    if os.path.exists(METRICS_LOG_FILE):
+        lines = tail(METRICS_LOG_FILE, 1)
+        return json.loads(lines[-1]) if lines and lines[-1].strip() else None
+    
+    if not os.path.exists(METRICS_FILE):
+        return None
+    
+    if ijson is not None:
+        # Stream the legacy array, keeping only the last item in memory
+        last = None
+        with open(METRICS_FILE, 'rb') as f:
+            for last in ijson.items(f, 'item', use_float=True):
+                pass
+        return last
+    
+    metrics = _load_json_cached(METRICS_FILE, [])
+    return metrics[-1] if metrics else None
+
+# The dashboard page as (st_mtime_ns, raw bytes, gzip bytes, ETag), rebuilt
+# only when the template file changes
+_page_cache = (-1, b"", b"", "")
+
+def _dashboard_page():
+    """Return the cached dashboard page, re-reading and re-compressing it if the file changed"""
+    global _page_cache
+    
+    mtime_ns = os.stat(DASHBOARD_PAGE).st_mtime_ns
+    if _page_cache[0] != mtime_ns:
+        raw = Path(DASHBOARD_PAGE).read_bytes()
+        etag = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        _page_cache = (mtime_ns, raw, gzip.compress(raw, compresslevel=9), etag)
+    return _page_cache
+
 @app.route('/')
 def index():
     """Render the main dashboard"""
-    return render_template('dashboard.html')
+    # Precompressed once per template version and revalidated with a strong ETag
+    _, raw, compressed, etag = _dashboard_page()
+    
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+    elif 'gzip' in request.headers.get('Accept-Encoding', ''):
+        response = app.response_class(compressed, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(raw, mimetype='text/html')
+    
+    response.set_etag(etag)
+    response.vary.add('Accept-Encoding')
+    response.headers['Cache-Control'] = 'public, max-age=300'
+    return response
+
+def _lttb_indices(values, threshold):
+    """
+    Pick the indices of threshold points that preserve the shape of a series
+    (Largest-Triangle-Three-Buckets), using the index as the x coordinate
+    
+    Args:
+        values (list): y values of the series
+        threshold (int): Number of points to keep
+        
+    Returns:
+        Sequence of selected indices, always including the first and last
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return range(n)
+    
+    every = (n - 2) / (threshold - 2)
+    selected = [0]
+    a = 0
+    
+    for i in range(threshold - 2):
+        # Average of the next bucket is the third corner of the triangle
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / (next_end - next_start)
+        
+        # Keep the point in this bucket forming the largest triangle with
+        # the previously kept point and the next bucket's average
+        ax, ay = a, values[a]
+        best, best_area = -1, -1.0
+        for j in range(int(i * every) + 1, next_start):
+            area = abs((ax - avg_x) * (values[j] - ay) - (ax - j) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        
+        selected.append(best)
+        a = best
+    
+    selected.append(n - 1)
+    return selected
+
+def get_metrics_data(max_points=MAX_CHART_POINTS):
+    """
+    Build the training metrics history payload (oldest first)
+    
+    Args:
+        max_points (int): Downsample longer histories to this many entries
+            with LTTB on accuracy (0 or None keeps every entry)
+    """
+    metrics = _load_metrics_history()
+    if not max_points or len(metrics) <= max_points:
+        return metrics
+    
+    accuracies = [m.get("accuracy") or 0.0 for m in metrics]
+    return [metrics[i] for i in _lttb_indices(accuracies, max_points)]
 
 @app.route('/api/metrics')
+@cached(timeout=API_CACHE_TIMEOUT, query_string=True, unless=_is_conditional_request)
 def api_metrics():
-    """Return training metrics data"""
+    """
+    Return training metrics data
+    
+    Query params:
+        max_points: Downsample to at most this many entries (default 500, 0 for all)
+    """
+    max_points = request.args.get("max_points", MAX_CHART_POINTS, type=int)
     try:
-        if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, 'r', encoding='utf-8') as f:
-                metrics = json.load(f)
-            return jsonify(metrics)
-        else:
-            return jsonify([])
+        return _conditional_json(_file_etag(METRICS_LOG_FILE, METRICS_FILE),
+                                 lambda: get_metrics_data(max_points))
     except Exception as e:
         logger.error(f"Error loading metrics: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def _feedback_mtimes():
+    """Return the mtime_ns of the approved and rejected files (None if missing)"""
+    mtimes = []
+    for path in (APPROVED_FILE, REJECTED_FILE):
+        try:
+            mtimes.append(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            mtimes.append(None)
+    return mtimes
+
+def _load_feedback_aggregates(mtimes):
+    """Return the sidecar aggregates if they were built from the current feedback files"""
+    try:
+        with open(FEEDBACK_AGG_FILE, 'r', encoding='utf-8') as f:
+            aggregates = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if aggregates.get("source_mtimes") != mtimes:
+        return None
+    return aggregates
+
+def rebuild_feedback_aggregates(mtimes):
+    """
+    Compute feedback statistics from the approved/rejected files and persist them
+    
+    Args:
+        mtimes (list): Source file mtimes taken before reading, stored for validation
+        
+    Returns:
+        dict: stats, intent_stats and the 10 most recent approved/rejected entries
+    """
+    # Imported lazily to keep dashboard startup fast; cached after the first call
+    import numpy as np
+    import pandas as pd
+    
+    approved_future = _IO_POOL.submit(_load_json_cached, APPROVED_FILE, [])
+    rejected_future = _IO_POOL.submit(_load_json_cached, REJECTED_FILE, [])
+    approved = approved_future.result()
+    rejected = rejected_future.result()
+    
+    # Calculate summary statistics
+    stats = {
+        "total_feedback": len(approved) + len(rejected),
+        "approved_count": len(approved),
+        "rejected_count": len(rejected),
+        "approval_rate": 0
+    }
+    
+    if stats["total_feedback"] > 0:
+        stats["approval_rate"] = stats["approved_count"] / stats["total_feedback"]
+    
+    # Group by intent and count good/bad ratings in one vectorized pass
+    columns = ["intent", "quality"]
+    df = pd.concat(
+        [pd.DataFrame(approved, columns=columns), pd.DataFrame(rejected, columns=columns)],
+        ignore_index=True
+    ).fillna("unknown")
+    
+    grouped = df.assign(
+        good=(df["quality"] == "good").astype(np.int8),
+        bad=(df["quality"] == "bad").astype(np.int8)
+    ).groupby("intent", sort=False).agg(
+        good=("good", "sum"),
+        bad=("bad", "sum"),
+        total=("intent", "size")
+    )
+    
+    # Calculate approval rates by intent, sorted by total count
+    grouped["approval_rate"] = grouped["good"] / grouped["total"]
+    intent_stats = grouped.sort_values("total", ascending=False, kind="stable").reset_index().to_dict("records")
+    
+    aggregates = {
+        "source_mtimes": mtimes,
+        "stats": stats,
+        "intent_stats": intent_stats,
+        "recent_approved": approved[-10:],
+        "recent_rejected": rejected[-10:]
+    }
+    
+    # Persist atomically; a failed write only costs a recompute next time
+    try:
+        tmp_path = FEEDBACK_AGG_FILE + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(aggregates, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, FEEDBACK_AGG_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write feedback aggregates: {e}")
+    
+    return aggregates
+
+def get_feedback_data():
+    """Build the feedback statistics and recent approved/rejected entries payload"""
+    mtimes = _feedback_mtimes()
+    aggregates = _load_feedback_aggregates(mtimes)
+    if aggregates is None:
+        aggregates = rebuild_feedback_aggregates(mtimes)
+    
+    return {
+        "stats": aggregates["stats"],
+        "intent_stats": aggregates["intent_stats"],
+        "recent_approved": _for_display(aggregates["recent_approved"]),
+        "recent_rejected": _for_display(aggregates["recent_rejected"])
+    }
 
 @app.route('/api/feedback')
+@cached(timeout=API_CACHE_TIMEOUT, unless=_is_conditional_request)
 def api_feedback():
     """Return feedback data"""
     try:
-        feedback_data = {
-            "approved": [],
-            "rejected": []
-        }
-        
-        if os.path.exists(APPROVED_FILE):
-            with open(APPROVED_FILE, 'r', encoding='utf-8') as f:
-                feedback_data["approved"] = json.load(f)
-        
-        if os.path.exists(REJECTED_FILE):
-            with open(REJECTED_FILE, 'r', encoding='utf-8') as f:
-                feedback_data["rejected"] = json.load(f)
-                
-        # Calculate summary statistics
-        stats = {
-            "total_feedback": len(feedback_data["approved"]) + len(feedback_data["rejected"]),
-            "approved_count": len(feedback_data["approved"]),
-            "rejected_count": len(feedback_data["rejected"]),
-            "approval_rate": 0
-        }
-        
-        if stats["total_feedback"] > 0:
-            stats["approval_rate"] = stats["approved_count"] / stats["total_feedback"]
-        
-        # Group by intent
-        intent_counts = {}
-        for entry in feedback_data["approved"] + feedback_data["rejected"]:
-            intent = entry.get("intent", "unknown")
-            quality = entry.get("quality", "unknown")
-            
-            if intent not in intent_counts:
-                intent_counts[intent] = {"good": 0, "bad": 0, "total": 0}
-            
-            intent_counts[intent]["total"] += 1
-            if quality == "good":
-                intent_counts[intent]["good"] += 1
-            elif quality == "bad":
-                intent_counts[intent]["bad"] += 1
-        
-        # Calculate approval rates by intent
-        intent_stats = []
-        for intent, counts in intent_counts.items():
-            if counts["total"] > 0:
-                approval_rate = counts["good"] / counts["total"]
-                intent_stats.append({
-                    "intent": intent,
-                    "good": counts["good"],
-                    "bad": counts["bad"],
-                    "total": counts["total"],
-                    "approval_rate": approval_rate
-                })
-        
-        # Sort by total count
-        intent_stats.sort(key=lambda x: x["total"], reverse=True)
-        
-        return jsonify({
-            "stats": stats,
-            "intent_stats": intent_stats,
-            "recent_approved": feedback_data["approved"][-10:],
-            "recent_rejected": feedback_data["rejected"][-10:]
-        })
-        
+        return _conditional_json(_file_etag(APPROVED_FILE, REJECTED_FILE), get_feedback_data)
     except Exception as e:
         logger.error(f"Error loading feedback data: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def _parse_log_line(line):
+    """Parse one chatbot.log line into a log entry dict, or None if it is malformed"""
+    match = LOG_RE.match(line)
+    if match is None:
+        return None
+    entry = match.groupdict()
+    entry["display_ts"] = _display_ts(entry["timestamp"])
+    return entry
+
+def get_logs_data():
+    """Build the recent log entries payload (last 200 parsed lines)"""
+    global _log_cache
+    
+    try:
+        st = os.stat(LOG_FILE)
+    except FileNotFoundError:
+        return []
+    
+    # Nothing appended since the last parse: reuse it
+    size, mtime_ns, cached_entries = _log_cache
+    if size == st.st_size and mtime_ns == st.st_mtime_ns:
+        return cached_entries
+    
+    # Parse log lines
+    log_entries = []
+    for line in tail(LOG_FILE, 200):  # Last 200 lines
+        entry = _parse_log_line(line)
+        if entry is not None:  # Skip malformed lines
+            log_entries.append(entry)
+    
+    _log_cache = (st.st_size, st.st_mtime_ns, log_entries)
+    return log_entries
+
+def recent_logs(limit=None, order="asc"):
+    """
+    Return the newest parsed log entries
+    
+    Args:
+        limit (int): Keep only this many of the newest entries (default: all)
+        order (str): "asc" for oldest first, "desc" for newest first
+        
+    Returns:
+        list: Log entry dicts
+    """
+    entries = get_logs_data()
+    if limit is not None:
+        entries = entries[-limit:] if limit > 0 else []
+    return entries[::-1] if order == "desc" else entries
+
+def _is_uncached_logs_request():
+    """Conditional and streamed (NDJSON) log requests bypass the view cache"""
+    return _is_conditional_request() or request.args.get("format") == "ndjson"
 
 @app.route('/api/logs')
+@cached(timeout=LOG_CACHE_TIMEOUT, query_string=True, unless=_is_uncached_logs_request)
 def api_logs():
-    """Return recent log entries"""
+    """
+    Return recent log entries
+    
+    Query params:
+        limit: Number of newest entries to return (default: all parsed)
+        order: "asc" (default) or "desc" for newest first
+        format: "json" (default) or "ndjson" to stream one entry per line
+    """
+    limit = request.args.get("limit", type=int)
+    order = request.args.get("order", "asc")
     try:
-        if os.path.exists(LOG_FILE):
-            with open(LOG_FILE, 'r', encoding='utf-8') as f:
-                log_lines = f.readlines()
-            
-            # Parse log lines
-            log_entries = []
-            for line in log_lines[-200:]:  # Last 200 lines
-                try:
-                    parts = line.strip().split(' - ', 3)
-                    if len(parts) >= 4:
-                        timestamp = parts[0]
-                        module = parts[1]
-                        level = parts[2]
-                        message = parts[3]
-                        
-                        log_entries.append({
-                            "timestamp": timestamp,
-                            "module": module,
-                            "level": level,
-                            "message": message
-                        })
-                except:
-                    # Skip malformed lines
-                    continue
-            
-            return jsonify(log_entries)
-        else:
-            return jsonify([])
+        if request.args.get("format") == "ndjson":
+            return _ndjson(recent_logs(limit, order))
+        return _conditional_json(_file_etag(LOG_FILE), lambda: recent_logs(limit, order))
     except Exception as e:
         logger.error(f"Error loading logs: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def _follow_log(start=None, poll_interval=1.0, heartbeat=15.0, max_duration=STREAM_MAX_SECONDS):
+    """
+    Yield Server-Sent Events for entries appended to the log file
+    
+    Starts at byte offset start (the id of the last event a reconnecting
+    client received) or the current end of the file, emits a 'log' event
+    per new parsed line and a comment every heartbeat seconds so idle
+    connections are not dropped by proxies. Stops after max_duration seconds.
+    """
+    if start is None:
+        try:
+            start = os.path.getsize(LOG_FILE)
+        except FileNotFoundError:
+            start = 0
+    position = max(start, 0)
+    partial = b""
+    last_sent = time.monotonic()
+    deadline = last_sent + max_duration
+    
+    yield b"retry: %d\n\n" % STREAM_RETRY_MS
+    
+    while time.monotonic() < deadline:
+        try:
+            size = os.path.getsize(LOG_FILE)
+        except FileNotFoundError:
+            size = 0
+        
+        if size < position:  # Truncated or rotated: start over
+            position, partial = 0, b""
+        
+        if size > position:
+            with open(LOG_FILE, 'rb') as f:
+                f.seek(position)
+                chunk = f.read(size - position)
+            offset = position - len(partial)  # Where partial + chunk starts
+            position += len(chunk)
+            
+            # Hold back an incomplete last line until the rest is written
+            lines = (partial + chunk).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                offset += len(line) + 1
+                entry = _parse_log_line(line.decode('utf-8', errors='replace').rstrip("\r"))
+                if entry is not None:
+                    yield b"id: %d\nevent: log\ndata: " % offset + _dumps(entry) + b"\n\n"
+                    last_sent = time.monotonic()
+        
+        if time.monotonic() - last_sent >= heartbeat:
+            yield b": keep-alive\n\n"
+            last_sent = time.monotonic()
+        
+        time.sleep(poll_interval)
+
+@app.route('/api/stream')
+def api_stream():
+    """Push new log entries to the dashboard as Server-Sent Events"""
+    start = request.headers.get("Last-Event-ID", type=int)
+    return app.response_class(
+        _follow_log(start),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def get_conversations_data():
+    """Build the recent conversations payload"""
+    # This is just placeholder data - in a real implementation,
+    # you would load this from a database or conversation logs
+    sample_conversations = [
+        {
+            "id": "conv1",
+            "user_id": "user123",
+            "timestamp": "2025-05-08T14:25:30.123",
+            "exchanges": [
+                {"user": "Hello there", "bot": "Hi! How can I help you today?"},
+                {"user": "What's the weather like?", "bot": "I'd be happy to check the weather for you. Which city are you interested in?"},
+                {"user": "New York", "bot": "The weather in New York is currently 72°F and partly cloudy with a light breeze."}
+            ],
+            "metrics": {
+                "duration": 45,
+                "turns": 3,
+                "avg_response_time": 0.8
+            }
+        },
+        {
+            "id": "conv2",
+            "user_id": "user456",
+            "timestamp": "2025-05-08T15:10:45.678",
+            "exchanges": [
+                {"user": "Hi, I need help", "bot": "Hello! I'm here to help. What do you need assistance with?"},
+                {"user": "My name is Sarah", "bot": "Nice to meet you, Sarah! I'll remember your name. How can I help you today?"},
+                {"user": "What can you do?", "bot": "I can chat with you about various topics, remember your preferences, check the weather, and more. Is there something specific you'd like to know about?"},
+                {"user": "No thanks, goodbye", "bot": "Alright, Sarah! Have a great day. Feel free to chat anytime!"}
+            ],
+            "metrics": {
+                "duration": 90,
+                "turns": 4,
+                "avg_response_time": 1.2
+            }
+        }
+    ]
+    return [
+        dict(
+            conversation,
+            display_ts=_display_ts(conversation["timestamp"]),
+            exchanges=[{"user": _clean_text(exchange["user"]), "bot": _clean_text(exchange["bot"])}
+                       for exchange in conversation["exchanges"]]
+        )
+        for conversation in sample_conversations
+    ]
 
 @app.route('/api/conversations')
+@cached(timeout=API_CACHE_TIMEOUT)
 def api_conversations():
     """Return recent conversations"""
     try:
-        # This is just placeholder data - in a real implementation,
-        # you would load this from a database or conversation logs
-        sample_conversations = [
-            {
-                "id": "conv1",
-                "user_id": "user123",
-                "timestamp": "2025-05-08T14:25:30.123",
-                "exchanges": [
-                    {"user": "Hello there", "bot": "Hi! How can I help you today?"},
-                    {"user": "What's the weather like?", "bot": "I'd be happy to check the weather for you. Which city are you interested in?"},
-                    {"user": "New York", "bot": "The weather in New York is currently 72°F and partly cloudy with a light breeze."}
-                ],
-                "metrics": {
-                    "duration": 45,
-                    "turns": 3,
-                    "avg_response_time": 0.8
-                }
-            },
-            {
-                "id": "conv2",
-                "user_id": "user456",
-                "timestamp": "2025-05-08T15:10:45.678",
-                "exchanges": [
-                    {"user": "Hi, I need help", "bot": "Hello! I'm here to help. What do you need assistance with?"},
-                    {"user": "My name is Sarah", "bot": "Nice to meet you, Sarah! I'll remember your name. How can I help you today?"},
-                    {"user": "What can you do?", "bot": "I can chat with you about various topics, remember your preferences, check the weather, and more. Is there something specific you'd like to know about?"},
-                    {"user": "No thanks, goodbye", "bot": "Alright, Sarah! Have a great day. Feel free to chat anytime!"}
-                ],
-                "metrics": {
-                    "duration": 90,
-                    "turns": 4,
-                    "avg_response_time": 1.2
-                }
-            }
-        ]
-        return jsonify(sample_conversations)
+        return ojsonify(get_conversations_data())
     except Exception as e:
         logger.error(f"Error loading conversations: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def get_intents_data():
+    """Build the intent distribution and per-intent performance payload"""
+    # Load training data to get intent distribution
+    training_data_path = os.path.join(DATA_DIR, "intent_training_data.json")
+    # Load training data and metrics history in parallel
+    training_future = _IO_POOL.submit(_load_json_cached, training_data_path, [])
+    latest_future = _IO_POOL.submit(last_metrics_entry)
+    training_data = training_future.result()
+    
+    # Count examples per intent
+    intent_distribution = Counter(item["intent"] for item in training_data if item.get("intent"))
+    
+    # Convert to list format (most common first) for easier consumption by charts
+    intent_counts = [{"intent": intent, "count": count} for intent, count in intent_distribution.most_common()]
+    
+    # Get performance from metrics if available
+    intent_performance = []
+    
+    # Get the most recent metrics
+    latest_metrics = latest_future.result()
+    
+    if latest_metrics:
+        # Extract intent-specific metrics if available
+        report = latest_metrics.get("report", {})
+        for intent, stats in report.items():
+            if isinstance(stats, dict) and "f1-score" in stats:
+                intent_performance.append({
+                    "intent": intent,
+                    "precision": stats.get("precision", 0),
+                    "recall": stats.get("recall", 0),
+                    "f1_score": stats.get("f1-score", 0)
+                })
+    
+    return {
+        "distribution": intent_counts,
+        "performance": intent_performance
+    }
 
 @app.route('/api/intents')
+@cached(timeout=API_CACHE_TIMEOUT)
 def api_intents():
     """Return intent distribution and performance"""
     try:
-        # Load training data to get intent distribution
-        training_data_path = os.path.join(DATA_DIR, "intent_training_data.json")
-        intent_distribution = {}
-        
-        if os.path.exists(training_data_path):
-            with open(training_data_path, 'r', encoding='utf-8') as f:
-                training_data = json.load(f)
-                
-                # Count examples per intent
-                for item in training_data:
-                    intent = item.get("intent")
-                    if intent:
-                        if intent not in intent_distribution:
-                            intent_distribution[intent] = 0
-                        intent_distribution[intent] += 1
-        
-        # Convert to list format for easier consumption by charts
-        intent_counts = [{"intent": intent, "count": count} for intent, count in intent_distribution.items()]
-        intent_counts.sort(key=lambda x: x["count"], reverse=True)
-        
-        # Get performance from metrics if available
-        intent_performance = []
-        if os.path.exists(METRICS_FILE):
-            with open(METRICS_FILE, 'r', encoding='utf-8') as f:
-                metrics = json.load(f)
-                
-                if metrics and len(metrics) > 0:
-                    # Get the most recent metrics
-                    latest_metrics = metrics[-1]
-                    
-                    # Extract intent-specific metrics if available
-                    report = latest_metrics.get("report", {})
-                    for intent, stats in report.items():
-                        if isinstance(stats, dict) and "f1-score" in stats:
-                            intent_performance.append({
-                                "intent": intent,
-                                "precision": stats.get("precision", 0),
-                                "recall": stats.get("recall", 0),
-                                "f1_score": stats.get("f1-score", 0)
-                            })
-        
-        return jsonify({
-            "distribution": intent_counts,
-            "performance": intent_performance
-        })
+        return ojsonify(get_intents_data())
     except Exception as e:
         logger.error(f"Error loading intent data: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def get_entities_data():
+    """Build the entity extraction statistics payload"""
+    # This is placeholder data - in a real implementation,
+    # you would collect and store entity extraction statistics
+    entity_stats = [
+        {"type": "location", "count": 285, "accuracy": 0.92},
+        {"type": "date", "count": 173, "accuracy": 0.88},
+        {"type": "person_name", "count": 124, "accuracy": 0.95},
+        {"type": "time", "count": 87, "accuracy": 0.91},
+        {"type": "favorite_color", "count": 52, "accuracy": 0.98},
+        {"type": "favorite_food", "count": 45, "accuracy": 0.93},
+        {"type": "email", "count": 23, "accuracy": 0.99},
+        {"type": "phone", "count": 18, "accuracy": 0.97},
+        {"type": "organization", "count": 14, "accuracy": 0.85}
+    ]
+    return entity_stats
 
 @app.route('/api/entities')
+@cached(timeout=API_CACHE_TIMEOUT)
 def api_entities():
     """Return entity extraction statistics"""
     try:
-        # This is placeholder data - in a real implementation,
-        # you would collect and store entity extraction statistics
-        entity_stats = [
-            {"type": "location", "count": 285, "accuracy": 0.92},
-            {"type": "date", "count": 173, "accuracy": 0.88},
-            {"type": "person_name", "count": 124, "accuracy": 0.95},
-            {"type": "time", "count": 87, "accuracy": 0.91},
-            {"type": "favorite_color", "count": 52, "accuracy": 0.98},
-            {"type": "favorite_food", "count": 45, "accuracy": 0.93},
-            {"type": "email", "count": 23, "accuracy": 0.99},
-            {"type": "phone", "count": 18, "accuracy": 0.97},
-            {"type": "organization", "count": 14, "accuracy": 0.85}
-        ]
-        return jsonify(entity_stats)
+        return ojsonify(get_entities_data())
     except Exception as e:
         logger.error(f"Error loading entity stats: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+# Sample performance history, generated on first use and then reused so the
+# payload (and its ETag) only changes when the process restarts
+_performance_sample = None
+
+def get_performance_data():
+    """Build the daily performance metrics payload"""
+    global _performance_sample
+    if _performance_sample is None:
+        _performance_sample = _build_performance_sample()
+    return _performance_sample
+
+def _build_performance_sample():
+    """Generate 14 days of sample performance metrics"""
+    import numpy as np
+    import pandas as pd
+    
+    # This is placeholder data - in a real implementation,
+    # you would collect and store performance metrics
+    rng = np.random.default_rng()
+    n = 14
+    
+    # Generate 14 days of sample data, oldest first, indexed by date
+    dates = (np.datetime64(datetime.date.today(), 'D') - np.arange(n - 1, -1, -1)).astype(str)
+    df = pd.DataFrame({
+        "avg_response_time": np.round(rng.uniform(0.5, 2.0, n), 2),
+        "requests": rng.integers(100, 501, n),
+        "accuracy": np.round(rng.uniform(0.75, 0.95, n), 2),
+        "user_rating": np.round(rng.uniform(3.5, 4.8, n), 1)
+    }, index=pd.Index(dates, name="date"))
+    
+    # 7-day moving average computed server-side
+    df["accuracy_7d"] = df["accuracy"].rolling(7, min_periods=1).mean().round(4)
+    
+    return df.reset_index().to_dict(orient="records")
 
 @app.route('/api/performance')
+@cached(timeout=API_CACHE_TIMEOUT)
 def api_performance():
     """Return performance metrics over time"""
     try:
-        # This is placeholder data - in a real implementation,
-        # you would collect and store performance metrics
-        now = datetime.datetime.now()
-        performance_data = []
-        
-        # Generate 14 days of sample data
-        for i in range(14):
-            date = (now - datetime.timedelta(days=i)).strftime("%Y-%m-%d")
-            performance_data.append({
-                "date": date,
-                "avg_response_time": round(random.uniform(0.5, 2.0), 2),
-                "requests": random.randint(100, 500),
-                "accuracy": round(random.uniform(0.75, 0.95), 2),
-                "user_rating": round(random.uniform(3.5, 4.8), 1)
-            })
-        
-        # Sort by date
-        performance_data.sort(key=lambda x: x["date"])
-        
-        return jsonify(performance_data)
+        return ojsonify(get_performance_data())
     except Exception as e:
         logger.error(f"Error loading performance data: {e}")
-        return jsonify({"error": str(e)})
+        return ojsonify({"error": str(e)})
+
+def get_server_stats():
+    """Summarize the dashboard's own request counters"""
+    with _request_stats_lock:
+        count = _request_count
+        durations = sorted(_request_durations)
+    
+    if not durations:
+        return {"requests": count, "avg_ms": None, "p50_ms": None, "p95_ms": None}
+    
+    return {
+        "requests": count,
+        "avg_ms": round(statistics.fmean(durations) * 1000, 2),
+        "p50_ms": round(statistics.median(durations) * 1000, 2),
+        "p95_ms": round(durations[min(int(0.95 * len(durations)), len(durations) - 1)] * 1000, 2)
+    }
+
+@app.route('/api/server_stats')
+def api_server_stats():
+    """Return request count and latency percentiles for this dashboard server"""
+    return ojsonify(get_server_stats())
+
+def _training_chart(metrics):
+    """Shape the metrics history into the training chart's parallel arrays"""
+    return {
+        "labels": [m.get("timestamp") for m in metrics],
+        "accuracies": [m.get("accuracy") for m in metrics],
+        "examples": [m.get("training_examples") for m in metrics]
+    }
+
+def _feedback_view(feedback):
+    """Keep what the feedback card shows, with the top 5 intents as chart arrays"""
+    # Rank by the good + bad counts the chart actually stacks; intent_stats is
+    # ordered by total entries, which also counts unrated feedback
+    top5 = heapq.nlargest(5, feedback["intent_stats"], key=lambda item: item["good"] + item["bad"])
+    return {
+        "stats": feedback["stats"],
+        "recent_rejected": feedback["recent_rejected"],
+        "chart": {
+            "labels": [item["intent"] for item in top5],
+            "good": [item["good"] for item in top5],
+            "bad": [item["bad"] for item in top5]
+        }
+    }
+
+def _intent_chart(intents):
+    """Shape the 10 most common intents into the intent chart's arrays"""
+    top10 = intents["distribution"][:10]  # Already sorted by count
+    return {
+        "labels": [item["intent"] for item in top10],
+        "counts": [item["count"] for item in top10]
+    }
+
+def _entity_chart(entities):
+    """Shape entity stats, sorted by count, into the entity chart's arrays"""
+    counts = [item["count"] for item in entities]
+    order = sorted(range(len(counts)), key=counts.__getitem__, reverse=True)
+    
+    # Gather all three arrays in a single pass over the sorted indices
+    labels, sorted_counts, accuracies = [], [], []
+    for i in order:
+        item = entities[i]
+        labels.append(item["type"])
+        sorted_counts.append(counts[i])
+        accuracies.append(item["accuracy"] * 100)
+    
+    return {"labels": labels, "counts": sorted_counts, "accuracies": accuracies}
+
+# Sections returned by /api/dashboard, keyed by payload name. Chart sections
+# are pre-sorted, pre-sliced and split into the arrays Chart.js consumes.
+_DASHBOARD_SECTIONS = {
+    "metrics": lambda: _training_chart(get_metrics_data()),
+    "feedback": lambda: _feedback_view(get_feedback_data()),
+    "intents": lambda: _intent_chart(get_intents_data()),
+    "entities": lambda: _entity_chart(get_entities_data()),
+    "performance": get_performance_data,
+    "conversations": get_conversations_data,
+    "logs": lambda: recent_logs(50, "desc")  # 50 newest first
+}
+
+@app.route('/api/dashboard')
+@cached(timeout=LOG_CACHE_TIMEOUT, query_string=True)
+def api_dashboard():
+    """
+    Return dashboard sections in one response
+    
+    Query params:
+        sections: Comma-separated subset of sections to return (default: all)
+    """
+    requested = request.args.get("sections")
+    names = requested.split(",") if requested else list(_DASHBOARD_SECTIONS)
+    
+    payload = {}
+    for name in names:
+        build = _DASHBOARD_SECTIONS.get(name)
+        if build is None:
+            continue
+        try:
+            payload[name] = build()
+        except Exception as e:
+            # One failing section should not blank the whole dashboard
+            logger.error(f"Error loading {name} data: {e}")
+            payload[name] = {"error": str(e)}
+    return ojsonify(payload)
 
-# Create the HTML template
 @app.route('/templates/dashboard.html')
 def dashboard_template():
     """Return the dashboard HTML template"""
-    dashboard_html = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Chatbot Monitoring Dashboard</title>
-    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/css/bootstrap.min.css" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/chart.js@4.0.0/dist/chart.min.css">
-    <style>
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background-color: #f8f9fa;
-            padding-top: 20px;
-        }
-        .card {
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);
-            margin-bottom: 20px;
-        }
-        .card-header {
-            background-color: #4A90E2;
-            color: white;
-            font-weight: bold;
-            border-radius: 10px 10px 0 0;
-        }
-        .metric-card {
-            text-align: center;
-            padding: 15px;
-        }
-        .metric-value {
-            font-size: 2rem;
-            font-weight: bold;
-            color: #4A90E2;
-        }
-        .metric-label {
-            font-size: 0.9rem;
-            color: #6c757d;
-        }
-        .chart-container {
-            position: relative;
-            height: 300px;
-            width: 100%;
-        }
-        .log-entry {
-            border-bottom: 1px solid #e9ecef;
-            padding: 8px 0;
-        }
-        .badge-info {
-            background-color: #17a2b8;
-        }
-        .badge-warning {
-            background-color: #ffc107;
-            color: #212529;
-        }
-        .badge-error {
-            background-color: #dc3545;
-        }
-        .conversation-card {
-            border-left: 4px solid #4A90E2;
-            margin-bottom: 15px;
-        }
-        .user-message {
-            background-color: #e9ecef;
-            border-radius: 10px;
-            padding: 8px 12px;
-            margin: 5px 0;
-        }
-        .bot-message {
-            background-color: #d1ecf1;
-            border-radius: 10px;
-            padding: 8px 12px;
-            margin: 5px 0;
-        }
-        .refresh-btn {
-            float: right;
-            font-size: 0.8rem;
-        }
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1 class="mb-4">Chatbot Monitoring Dashboard</h1>
-        
-        <div class="row">
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="metric-value" id="total-conversations">--</div>
-                    <div class="metric-label">Total Conversations</div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="metric-value" id="avg-accuracy">--</div>
-                    <div class="metric-label">Average Accuracy</div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="metric-value" id="avg-response-time">--</div>
-                    <div class="metric-label">Avg Response Time (s)</div>
-                </div>
-            </div>
-            <div class="col-md-3">
-                <div class="card metric-card">
-                    <div class="metric-value" id="user-satisfaction">--</div>
-                    <div class="metric-label">User Satisfaction</div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row mt-4">
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Performance Over Time
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadPerformanceData()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div class="chart-container">
-                            <canvas id="performance-chart"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Intent Distribution
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadIntentData()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div class="chart-container">
-                            <canvas id="intent-chart"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row mt-4">
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        User Feedback
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadFeedbackData()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div class="row mb-3">
-                            <div class="col-6">
-                                <div class="card bg-success text-white">
-                                    <div class="card-body text-center">
-                                        <h3 id="approved-count">--</h3>
-                                        <small>Positive Feedback</small>
-                                    </div>
-                                </div>
-                            </div>
-                            <div class="col-6">
-                                <div class="card bg-danger text-white">
-                                    <div class="card-body text-center">
-                                        <h3 id="rejected-count">--</h3>
-                                        <small>Negative Feedback</small>
-                                    </div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <div class="chart-container" style="height: 200px;">
-                            <canvas id="feedback-chart"></canvas>
-                        </div>
-                        
-                        <h5 class="mt-3">Recent Problematic Responses:</h5>
-                        <div id="recent-rejected" class="mt-2" style="max-height: 200px; overflow-y: auto;">
-                            <div class="text-center text-muted">Loading...</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Entity Extraction Performance
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadEntityData()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div class="chart-container">
-                            <canvas id="entity-chart"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row mt-4">
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        Recent Conversations
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadConversations()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div id="conversations-container" style="max-height: 400px; overflow-y: auto;">
-                            <div class="text-center text-muted">Loading conversations...</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-            
-            <div class="col-md-6">
-                <div class="card">
-                    <div class="card-header">
-                        System Logs
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadLogs()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div id="logs-container" style="max-height: 400px; overflow-y: auto;">
-                            <div class="text-center text-muted">Loading logs...</div>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <div class="row mt-4">
-            <div class="col-md-12">
-                <div class="card">
-                    <div class="card-header">
-                        Model Training History
-                        <button class="btn btn-sm btn-light refresh-btn" onclick="loadMetrics()">
-                            <i class="bi bi-arrow-clockwise"></i> Refresh
-                        </button>
-                    </div>
-                    <div class="card-body">
-                        <div class="chart-container">
-                            <canvas id="training-chart"></canvas>
-                        </div>
-                    </div>
-                </div>
-            </div>
-        </div>
-        
-        <footer class="mt-4 mb-4 text-center text-muted">
-            <small>&copy; 2025 Wicked Chatbot Monitoring Dashboard</small>
-        </footer>
-    </div>
-
-    <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0-alpha1/dist/js/bootstrap.bundle.min.js"></script>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.0.0/dist/chart.umd.min.js"></script>
-    <script>
-        // Charts objects
-        let performanceChart = null;
-        let intentChart = null;
-        let feedbackChart = null;
-        let entityChart = null;
-        let trainingChart = null;
-        
-        // Main function to load all data
-        function loadAllData() {
-            loadPerformanceData();
-            loadIntentData();
-            loadFeedbackData();
-            loadEntityData();
-            loadConversations();
-            loadLogs();
-            loadMetrics();
-        }
-        
-        // Load performance data
-        function loadPerformanceData() {
-            fetch('/api/performance')
-                .then(response => response.json())
-                .then(data => {
-                    updatePerformanceMetrics(data);
-                    updatePerformanceChart(data);
-                })
-                .catch(error => console.error('Error loading performance data:', error));
-        }
-        
-        // Update performance metrics
-        function updatePerformanceMetrics(data) {
-            if (data.length > 0) {
-                const latest = data[data.length - 1];
-                
-                // Update metric cards
-                document.getElementById('total-conversations').textContent = 
-                    data.reduce((total, day) => total + day.requests, 0).toLocaleString();
-                
-                document.getElementById('avg-accuracy').textContent = 
-                    (data.reduce((total, day) => total + day.accuracy, 0) / data.length).toFixed(2);
-                
-                document.getElementById('avg-response-time').textContent = 
-                    (data.reduce((total, day) => total + day.avg_response_time, 0) / data.length).toFixed(2);
-                
-                document.getElementById('user-satisfaction').textContent = 
-                    (data.reduce((total, day) => total + day.user_rating, 0) / data.length).toFixed(1);
-            }
-        }
-        
-        // Update performance chart
-        function updatePerformanceChart(data) {
-            const ctx = document.getElementById('performance-chart').getContext('2d');
-            
-            const labels = data.map(day => day.date);
-            const accuracyData = data.map(day => day.accuracy);
-            const responseTimeData = data.map(day => day.avg_response_time);
-            
-            if (performanceChart) {
-                performanceChart.destroy();
-            }
-            
-            performanceChart = new Chart(ctx, {
-                type: 'line',
-                data: {
-                    labels: labels,
-                    datasets: [
-                        {
-                            label: 'Accuracy',
-                            data: accuracyData,
-                            borderColor: '#4A90E2',
-                            backgroundColor: 'rgba(74, 144, 226, 0.1)',
-                            yAxisID: 'y',
-                            tension: 0.3
-                        },
-                        {
-                            label: 'Response Time (s)',
-                            data: responseTimeData,
-                            borderColor: '#F39C12',
-                            backgroundColor: 'rgba(243, 156, 18, 0.1)',
-                            yAxisID: 'y1',
-                            tension: 0.3
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            type: 'linear',
-                            display: true,
-                            position: 'left',
-                            min: 0,
-                            max: 1,
-                            title: {
-                                display: true,
-                                text: 'Accuracy'
-                            }
-                        },
-                        y1: {
-                            type: 'linear',
-                            display: true,
-                            position: 'right',
-                            min: 0,
-                            title: {
-                                display: true,
-                                text: 'Response Time (s)'
-                            },
-                            grid: {
-                                drawOnChartArea: false
-                            }
-                        }
-                    }
-                }
-            });
-        }
-        
-        // Load intent data
-        function loadIntentData() {
-            fetch('/api/intents')
-                .then(response => response.json())
-                .then(data => {
-                    updateIntentChart(data);
-                })
-                .catch(error => console.error('Error loading intent data:', error));
-        }
-        
-        // Update intent chart
-        function updateIntentChart(data) {
-            const ctx = document.getElementById('intent-chart').getContext('2d');
-            
-            const distribution = data.distribution || [];
-            
-            // Sort by count and take top 10
-            const top10 = distribution.slice(0, 10);
-            
-            const labels = top10.map(item => item.intent);
-            const counts = top10.map(item => item.count);
-            
-            if (intentChart) {
-                intentChart.destroy();
-            }
-            
-            intentChart = new Chart(ctx, {
-                type: 'bar',
-                data: {
-                    labels: labels,
-                    datasets: [
-                        {
-                            label: 'Training Examples',
-                            data: counts,
-                            backgroundColor: 'rgba(74, 144, 226, 0.7)',
-                            borderColor: '#4A90E2',
-                            borderWidth: 1
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            beginAtZero: true,
-                            title: {
-                                display: true,
-                                text: 'Number of Examples'
-                            }
-                        }
-                    }
-                }
-            });
-        }
-        
-        // Load feedback data
-        function loadFeedbackData() {
-            fetch('/api/feedback')
-                .then(response => response.json())
-                .then(data => {
-                    updateFeedbackStats(data);
-                    updateFeedbackChart(data);
-                    updateRecentRejected(data);
-                })
-                .catch(error => console.error('Error loading feedback data:', error));
-        }
-        
-        // Update feedback statistics
-        function updateFeedbackStats(data) {
-            const stats = data.stats || {};
-            
-            document.getElementById('approved-count').textContent = stats.approved_count || 0;
-            document.getElementById('rejected-count').textContent = stats.rejected_count || 0;
-        }
-        
-        // Update feedback chart
-        function updateFeedbackChart(data) {
-            const ctx = document.getElementById('feedback-chart').getContext('2d');
-            
-            const intentStats = data.intent_stats || [];
-            
-            // Sort by total count and take top 5
-            const top5 = intentStats.slice(0, 5);
-            
-            const labels = top5.map(item => item.intent);
-            const goodData = top5.map(item => item.good);
-            const badData = top5.map(item => item.bad);
-            
-            if (feedbackChart) {
-                feedbackChart.destroy();
-            }
-            
-            feedbackChart = new Chart(ctx, {
-                type: 'bar',
-                data: {
-                    labels: labels,
-                    datasets: [
-                        {
-                            label: 'Positive Feedback',
-                            data: goodData,
-                            backgroundColor: 'rgba(40, 167, 69, 0.7)',
-                            borderColor: '#28a745',
-                            borderWidth: 1
-                        },
-                        {
-                            label: 'Negative Feedback',
-                            data: badData,
-                            backgroundColor: 'rgba(220, 53, 69, 0.7)',
-                            borderColor: '#dc3545',
-                            borderWidth: 1
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            beginAtZero: true,
-                            title: {
-                                display: true,
-                                text: 'Feedback Count'
-                            },
-                            stacked: true
-                        },
-                        x: {
-                            stacked: true
-                        }
-                    }
-                }
-            });
-        }
-        
-        // Update recent rejected feedback
-        function updateRecentRejected(data) {
-            const recentRejected = data.recent_rejected || [];
-            const container = document.getElementById('recent-rejected');
-            
-            if (recentRejected.length === 0) {
-                container.innerHTML = '<div class="text-center text-muted">No negative feedback yet</div>';
-                return;
-            }
-            
-            let html = '';
-            
-            for (const item of recentRejected) {
-                const date = new Date(item.timestamp).toLocaleString();
-                
-                html += `
-                    <div class="log-entry">
-                        <div><strong>User:</strong> ${item.user_input}</div>
-                        <div><strong>Bot:</strong> ${item.response}</div>
-                        <div><small class="text-muted">Intent: ${item.intent || 'Unknown'} | ${date}</small></div>
-                    </div>
-                `;
-            }
-            
-            container.innerHTML = html;
-        }
-        
-        // Load entity data
-        function loadEntityData() {
-            fetch('/api/entities')
-                .then(response => response.json())
-                .then(data => {
-                    updateEntityChart(data);
-                })
-                .catch(error => console.error('Error loading entity data:', error));
-        }
-        
-        // Update entity chart
-        function updateEntityChart(data) {
-            const ctx = document.getElementById('entity-chart').getContext('2d');
-            
-            // Sort by count and take all
-            const sortedData = [...data].sort((a, b) => b.count - a.count);
-            
-            const labels = sortedData.map(item => item.type);
-            const counts = sortedData.map(item => item.count);
-            const accuracies = sortedData.map(item => item.accuracy * 100);
-            
-            if (entityChart) {
-                entityChart.destroy();
-            }
-            
-            entityChart = new Chart(ctx, {
-                type: 'bar',
-                data: {
-                    labels: labels,
-                    datasets: [
-                        {
-                            label: 'Extracted Count',
-                            data: counts,
-                            backgroundColor: 'rgba(74, 144, 226, 0.7)',
-                            borderColor: '#4A90E2',
-                            borderWidth: 1,
-                            yAxisID: 'y'
-                        },
-                        {
-                            label: 'Accuracy (%)',
-                            data: accuracies,
-                            backgroundColor: 'rgba(40, 167, 69, 0.7)',
-                            borderColor: '#28a745',
-                            borderWidth: 1,
-                            type: 'line',
-                            yAxisID: 'y1'
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            type: 'linear',
-                            display: true,
-                            position: 'left',
-                            beginAtZero: true,
-                            title: {
-                                display: true,
-                                text: 'Extraction Count'
-                            }
-                        },
-                        y1: {
-                            type: 'linear',
-                            display: true,
-                            position: 'right',
-                            beginAtZero: true,
-                            max: 100,
-                            title: {
-                                display: true,
-                                text: 'Accuracy (%)'
-                            },
-                            grid: {
-                                drawOnChartArea: false
-                            }
-                        }
-                    }
-                }
-            });
-        }
-        
-        // Load conversations
-        function loadConversations() {
-            fetch('/api/conversations')
-                .then(response => response.json())
-                .then(data => {
-                    updateConversations(data);
-                })
-                .catch(error => console.error('Error loading conversations:', error));
-        }
-        
-        // Update conversations
-        function updateConversations(data) {
-            const container = document.getElementById('conversations-container');
-            
-            if (data.length === 0) {
-                container.innerHTML = '<div class="text-center text-muted">No conversations yet</div>';
-                return;
-            }
-            
-            let html = '';
-            
-            for (const conversation of data) {
-                const date = new Date(conversation.timestamp).toLocaleString();
-                
-                html += `
-                    <div class="conversation-card p-3">
-                        <div class="d-flex justify-content-between mb-2">
-                            <div><strong>User ID:</strong> ${conversation.user_id}</div>
-                            <div><small class="text-muted">${date}</small></div>
-                        </div>
-                        <div class="mb-2">
-                            <strong>Exchanges:</strong> ${conversation.exchanges.length} | 
-                            <strong>Duration:</strong> ${conversation.metrics.duration}s
-                        </div>
-                        <div>
-                `;
-                
-                // Add the first 3 exchanges
-                const displayExchanges = conversation.exchanges.slice(0, 3);
-                
-                for (const exchange of displayExchanges) {
-                    html += `
-                        <div class="user-message">${exchange.user}</div>
-                        <div class="bot-message">${exchange.bot}</div>
-                    `;
-                }
-                
-                // Add ellipsis if there are more exchanges
-                if (conversation.exchanges.length > 3) {
-                    html += `<div class="text-center text-muted">... ${conversation.exchanges.length - 3} more exchanges</div>`;
-                }
-                
-                html += `
-                        </div>
-                    </div>
-                `;
-            }
-            
-            container.innerHTML = html;
-        }
-        
-        // Load logs
-        function loadLogs() {
-            fetch('/api/logs')
-                .then(response => response.json())
-                .then(data => {
-                    updateLogs(data);
-                })
-                .catch(error => console.error('Error loading logs:', error));
-        }
-        
-        // Update logs
-        function updateLogs(data) {
-            const container = document.getElementById('logs-container');
-            
-            if (data.length === 0) {
-                container.innerHTML = '<div class="text-center text-muted">No logs available</div>';
-                return;
-            }
-            
-            let html = '';
-            
-            // Reverse to show newest first
-            const recentLogs = [...data].reverse().slice(0, 50);
-            
-            for (const log of recentLogs) {
-                let badgeClass = 'bg-secondary';
-                
-                if (log.level === 'INFO') {
-                    badgeClass = 'bg-info';
-                } else if (log.level === 'WARNING') {
-                    badgeClass = 'bg-warning text-dark';
-                } else if (log.level === 'ERROR') {
-                    badgeClass = 'bg-danger';
-                }
-                
-                html += `
-                    <div class="log-entry">
-                        <div>
-                            <span class="badge ${badgeClass}">${log.level}</span>
-                            <small class="text-muted">${log.timestamp} | ${log.module}</small>
-                        </div>
-                        <div>${log.message}</div>
-                    </div>
-                `;
-            }
-            
-            container.innerHTML = html;
-        }
-        
-        // Load metrics
-        function loadMetrics() {
-            fetch('/api/metrics')
-                .then(response => response.json())
-                .then(data => {
-                    updateTrainingChart(data);
-                })
-                .catch(error => console.error('Error loading metrics:', error));
-        }
-        
-        // Update training chart
-        function updateTrainingChart(data) {
-            const ctx = document.getElementById('training-chart').getContext('2d');
-            
-            if (data.length === 0) {
-                if (trainingChart) {
-                    trainingChart.destroy();
-                }
-                trainingChart = new Chart(ctx, {
-                    type: 'bar',
-                    data: {
-                        labels: ['No Data'],
-                        datasets: [{
-                            label: 'No training data available',
-                            data: [0],
-                            backgroundColor: 'rgba(200, 200, 200, 0.7)'
-                        }]
-                    },
-                    options: {
-                        responsive: true,
-                        maintainAspectRatio: false
-                    }
-                });
-                return;
-            }
-            
-            const timestamps = data.map(item => {
-                const date = new Date(item.timestamp);
-                return date.toLocaleDateString() + ' ' + date.toLocaleTimeString([], {hour: '2-digit', minute:'2-digit'});
-            });
-            
-            const accuracies = data.map(item => item.accuracy);
-            const examples = data.map(item => item.training_examples);
-            
-            if (trainingChart) {
-                trainingChart.destroy();
-            }
-            
-            trainingChart = new Chart(ctx, {
-                type: 'line',
-                data: {
-                    labels: timestamps,
-                    datasets: [
-                        {
-                            label: 'Accuracy',
-                            data: accuracies,
-                            borderColor: '#4A90E2',
-                            backgroundColor: 'rgba(74, 144, 226, 0.1)',
-                            yAxisID: 'y',
-                            tension: 0.3
-                        },
-                        {
-                            label: 'Training Examples',
-                            data: examples,
-                            borderColor: '#28a745',
-                            backgroundColor: 'rgba(40, 167, 69, 0.1)',
-                            yAxisID: 'y1',
-                            tension: 0.3
-                        }
-                    ]
-                },
-                options: {
-                    responsive: true,
-                    maintainAspectRatio: false,
-                    scales: {
-                        y: {
-                            type: 'linear',
-                            display: true,
-                            position: 'left',
-                            min: 0,
-                            max: 1,
-                            title: {
-                                display: true,
-                                text: 'Accuracy'
-                            }
-                        },
-                        y1: {
-                            type: 'linear',
-                            display: true,
-                            position: 'right',
-                            min: 0,
-                            title: {
-                                display: true,
-                                text: 'Training Examples'
-                            },
-                            grid: {
-                                drawOnChartArea: false
-                            }
-                        }
-                    }
-                }
-            });
-        }
-        
-        // Load all data on page load
-        window.addEventListener('load', loadAllData);
-        
-        // Reload data every 5 minutes
-        setInterval(loadAllData, 5 * 60 * 1000);
-    </script>
-</body>
-</html>
-    """
-    return dashboard_html
+    return index()
 
-# Add this for importing random in the /api/performance endpoint
-import random
+def serve(host="127.0.0.1", port=5001):
+    """
+    Serve the dashboard with gunicorn when it is installed, otherwise with
+    the threaded Werkzeug server
+    
+    Equivalent command line:
+        gunicorn -k gevent -w 1 --worker-connections 100 -b 127.0.0.1:5001 monitoring_dashboard:app
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # gunicorn is unavailable (e.g. on Windows); threads still let
+        # concurrent API requests overlap
+        logger.info("gunicorn not installed, using the threaded development server")
+        app.run(host=host, port=port, debug=False, threaded=True)
+        return
+    
+    try:
+        import gevent  # noqa: F401
+        worker_options = {"worker_class": "gevent", "worker_connections": 100}
+    except ImportError:
+        worker_options = {"worker_class": "gthread", "threads": 8}
+    
+    class DashboardServer(BaseApplication):
+        def load_config(self):
+            options = dict(worker_options, bind=f"{host}:{port}", workers=1)
+            for key, value in options.items():
+                self.cfg.set(key, value)
+        
+        def load(self):
+            return app
+    
+    DashboardServer().run()
 
 if __name__ == "__main__":
     # Run the dashboard on a different port than the main app
-    app.run(host="127.0.0.1", port=5001, debug=True)
\ No newline at end of file
+    if os.environ.get("FLASK_ENV") == "dev":
+        app.run(host="127.0.0.1", port=5001, debug=True)
+    else:
+        serve()
\ No newline at end of file
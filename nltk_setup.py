@@ -0,0 +1,219 @@
+# nltk_setup.py
+# Shared implementation for downloading and verifying the project's NLTK data
+import nltk
+import sys
+import os
+import logging
+from pathlib import Path
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger("nltk_downloader")
+
+# Project-local NLTK data directory
+_NLTK_DIR = Path(__file__).resolve().parent / "nltk_data"
+
+REQUIRED_PACKAGES = (
+    'punkt',
+    'wordnet',
+    'stopwords',
+    'averaged_perceptron_tagger',
+    'maxent_ne_chunker',
+    'words'
+)
+
+# Mapping of packages to their actual file paths
+_PACKAGE_PATHS = {
+    'punkt': _NLTK_DIR / 'tokenizers' / 'punkt',
+    'wordnet': _NLTK_DIR / 'corpora' / 'wordnet.zip',  # Check for zip file first
+    'stopwords': _NLTK_DIR / 'corpora' / 'stopwords',
+    'averaged_perceptron_tagger': _NLTK_DIR / 'taggers' / 'averaged_perceptron_tagger',
+    'maxent_ne_chunker': _NLTK_DIR / 'chunkers' / 'maxent_ne_chunker',
+    'words': _NLTK_DIR / 'corpora' / 'words'
+}
+
+# Alternative paths for some packages
+_ALTERNATIVE_PATHS = {
+    'wordnet': (
+        _NLTK_DIR / 'corpora' / 'wordnet',  # Directory
+        _NLTK_DIR / 'corpora' / 'wordnet.zip',  # Zip file
+        _NLTK_DIR / 'corpora' / 'WordNet-3.0.omw.sqlite',  # SQLite file
+        _NLTK_DIR / 'corpora' / 'omw-1.4',  # OMW directory
+        _NLTK_DIR / 'corpora' / 'omw'  # Alternative OMW directory
+    )
+}
+
+_MARKER_FILE = _NLTK_DIR / 'NLTK_INSTALLED'
+
+def create_download_session():
+    """
+    Create an HTTP session shared by all package downloads
+    
+    Keep-alive lets every package reuse the same connection instead of paying
+    a fresh TCP + TLS handshake each time, and the retry adapter rides out
+    transient errors from raw.githubusercontent.com.
+    
+    Returns:
+        requests.Session: The configured session
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=5,
+        backoff_factor=1,
+        status_forcelist=[429, 500, 502, 503, 504]
+    )
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retries))
+    return session
+
+def download_package(session, downloader, package, download_dir):
+    """
+    Download and unpack a single NLTK package over the shared session
+    
+    Args:
+        session (requests.Session): Session used for the HTTP request
+        downloader (nltk.downloader.Downloader): Downloader holding the package index
+        package (str): NLTK package identifier
+        download_dir (str): Target NLTK data directory
+    """
+    info = downloader.info(package)
+    target = os.path.join(download_dir, info.filename)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    
+    # Skip the transfer if an identical archive is already present
+    if os.path.exists(target) and nltk.downloader.md5_hexdigest(target) == info.checksum:
+        logger.info(f"{package} is already up to date")
+    else:
+        # Download next to the target and move it into place only once the
+        # checksum matches, so a broken transfer never looks like a good archive
+        partial = target + ".part"
+        try:
+            with session.get(info.url, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with open(partial, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        f.write(chunk)
+            if nltk.downloader.md5_hexdigest(partial) != info.checksum:
+                raise ValueError(f"checksum mismatch for {info.filename}")
+            os.replace(partial, target)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+    
+    if info.unzip:
+        nltk.downloader.unzip(target, os.path.join(download_dir, info.subdir), verbose=False)
+
+def download_nltk_data():
+    """Download all required NLTK data packages"""
+    # Create a custom download directory in the project folder
+    nltk_data_dir = str(_NLTK_DIR)
+    _NLTK_DIR.mkdir(parents=True, exist_ok=True)
+    
+    logger.info(f"Downloading NLTK data to: {nltk_data_dir}")
+    
+    # Set the download directory
+    if nltk_data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, nltk_data_dir)  # Add at the beginning to prioritize
+    
+    # One session (and one index fetch) shared across all packages
+    session = create_download_session()
+    downloader = nltk.downloader.Downloader(download_dir=nltk_data_dir)
+    
+    success = True
+    for package in REQUIRED_PACKAGES:
+        logger.info(f"Downloading {package}...")
+        try:
+            download_package(session, downloader, package, nltk_data_dir)
+            logger.info(f"Successfully downloaded {package}")
+        except Exception as e:
+            logger.warning(f"Direct download of {package} failed ({e}), falling back to nltk.download")
+            try:
+                if not nltk.download(package, download_dir=nltk_data_dir, quiet=False):
+                    raise RuntimeError("nltk.download reported failure")
+                logger.info(f"Successfully downloaded {package}")
+            except Exception as e:
+                logger.error(f"Failed to download {package}: {e}")
+                success = False
+    
+    session.close()
+    
+    if success:
+        logger.info("All NLTK data packages downloaded successfully!")
+        
+        # Add a simple verification step
+        logger.info("Verifying installations...")
+        missing_packages = []
+        
+        # Check if each package directory exists
+        for package, path in _PACKAGE_PATHS.items():
+            if path.exists():
+                logger.info(f"✅ {package} is available at {path}")
+            elif package in _ALTERNATIVE_PATHS:
+                # Try alternative paths
+                found = False
+                for alt_path in _ALTERNATIVE_PATHS[package]:
+                    if alt_path.exists():
+                        logger.info(f"✅ {package} is available at {alt_path}")
+                        found = True
+                        break
+                if not found:
+                    logger.error(f"❌ {package} could not be verified (checked multiple paths)")
+                    missing_packages.append(package)
+            else:
+                logger.error(f"❌ {package} could not be verified at {path}")
+                missing_packages.append(package)
+        
+        if not missing_packages:
+            logger.info("All packages verified! NLTK setup complete.")
+            
+            # Create a marker file that indicates successful installation
+            with _MARKER_FILE.open('w') as f:
+                f.write("NLTK data successfully installed.")
+                
+            return True
+        elif len(missing_packages) == 1 and 'wordnet' in missing_packages:
+            # Special case for wordnet which often has verification issues
+            # but usually works fine in practice
+            logger.warning("Only wordnet verification failed, but this is a common issue.")
+            logger.warning("Marking installation as successful since wordnet is often packaged differently.")
+            logger.warning("If you experience issues with lemmatization later, please run this script again.")
+            
+            # Create a marker file that indicates mostly successful installation
+            with _MARKER_FILE.open('w') as f:
+                f.write("NLTK data successfully installed (wordnet verification issue noted).")
+                
+            return True
+        else:
+            logger.error(f"Some packages could not be verified: {', '.join(missing_packages)}")
+            return False
+    else:
+        logger.error("Some packages failed to download. See errors above.")
+        return False
+
+def main():
+    """Download the NLTK data and print usage instructions"""
+    print("Downloading required NLTK data packages...")
+    
+    if download_nltk_data():
+        print("\nNLTK data download complete! You can now train the ML model.")
+        
+        # Add usage instructions
+        print("\nTo use this NLTK data in your code, add the following lines:")
+        print("------------------------------------------------------------")
+        print(f"import nltk")
+        print(f"nltk.data.path.append('{_NLTK_DIR}')")
+        print("------------------------------------------------------------")
+        
+        return 0
+    else:
+        print("\nSome NLTK data packages failed to download. Please check the logs.")
+        print("You can try running this script again with administrator privileges.")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
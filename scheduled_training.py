@@ -4,13 +4,31 @@
 import os
 import sys
 import json
+import calendar
 import time
+import heapq
 import logging
+import sqlite3
 import datetime
+import gzip
 import subprocess
 import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from pathlib import Path
 
+# orjson is optional; it parses and serializes the config/status files several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# zstandard is optional; without it status blobs are gzip-compressed instead
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -27,11 +45,26 @@ SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(SCRIPT_DIR, "data")
 MODEL_DIR = os.path.join(DATA_DIR, "models")
 CONFIG_FILE = os.path.join(DATA_DIR, "scheduled_training_config.json")
+# Status is kept one row per key, so an update rewrites only the keys it changes.
+# STATUS_FILE is the legacy JSON status, imported into STATUS_DB on first use.
+STATUS_DB = os.path.join(DATA_DIR, "scheduled_training.sqlite")
 STATUS_FILE = os.path.join(DATA_DIR, "scheduled_training_status.json")
+# Large status values (trend and error analyses) are stored compressed in
+# STATUS_BLOB_DIR, with only a {"$ref": filename} pointer kept in STATUS_DB
+STATUS_BLOB_DIR = os.path.join(DATA_DIR, "status")
+STATUS_BLOB_KEYS = {"training_trends": "trends", "error_analysis": "errors"}
+# Empty file whose mtime is the next scheduled training time, so a "check"
+# run can tell that nothing is due from two stat calls
+NEXT_TRAINING_STAMP = os.path.join(DATA_DIR, "next_training.stamp")
+
+# Make the project modules importable (once, rather than on every training run)
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 # Create directories if they don't exist
 os.makedirs(DATA_DIR, exist_ok=True)
 os.makedirs(MODEL_DIR, exist_ok=True)
+os.makedirs(STATUS_BLOB_DIR, exist_ok=True)
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -42,11 +75,207 @@ DEFAULT_CONFIG = {
     "incorporate_feedback": True,
     "cleanup_old_models": True,
     "keep_models": 5,
+    "max_model_cache_mb": None,  # Optional size budget for the kept models
     "notification_email": None,
     "enabled": True,
     "next_training_time": None
 }
 
+# Parsed JSON files keyed by path: path -> ((st_mtime_ns, st_size), parsed object).
+# Cached objects are shared between callers and must not be mutated.
+_json_cache = {}
+
+def _read_json_cached(path, default=None):
+    """
+    Load a JSON file, reusing the parsed result while its mtime and size are unchanged
+    
+    Args:
+        path (str): File to load
+        default: Value returned when the file does not exist
+        
+    Returns:
+        The parsed file contents, or default
+    """
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return default
+    
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _json_cache.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    _json_cache[path] = (key, data)
+    return data
+
+def _dump_json(obj, path):
+    """
+    Write a dict as indented JSON, using orjson when it is available
+    
+    The file is written in one buffered write to a per-process temporary
+    path and moved into place, so readers (and a concurrent cron run) never
+    see a partially written file. The written dict then becomes the cached
+    copy, so the next read does not parse it back.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        data = json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+    
+    try:
+        with open(tmp_path, 'wb', buffering=64 * 1024) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    # Shallow copy so later changes to the caller's dict do not leak into the cache
+    st = os.stat(path)
+    _json_cache[path] = ((st.st_mtime_ns, st.st_size), dict(obj))
+
+def _dumps(obj):
+    """Serialize a status value to JSON bytes, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+def _loads(data):
+    """Parse a JSON status value, using orjson when it is available"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _write_status_blob(name, value):
+    """
+    Store a large status value as a compressed file in STATUS_BLOB_DIR
+    
+    Args:
+        name (str): File name without the extension
+        value: JSON-serializable value to store
+        
+    Returns:
+        dict: A {"$ref": filename} pointer to store in place of the value
+    """
+    data = _dumps(value)
+    if zstandard is not None:
+        filename = f"{name}.json.zst"
+        data = zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        filename = f"{name}.json.gz"
+        data = gzip.compress(data, compresslevel=6)
+    
+    Path(STATUS_BLOB_DIR, filename).write_bytes(data)
+    return {"$ref": filename}
+
+def _read_status_blob(value):
+    """
+    Resolve a status value that may be a {"$ref": filename} pointer
+    
+    Args:
+        value: A status value as stored in STATUS_DB
+        
+    Returns:
+        The stored value, loaded from its blob file if it is a pointer
+    """
+    if not (isinstance(value, dict) and "$ref" in value):
+        return value
+    
+    filename = value["$ref"]
+    data = Path(STATUS_BLOB_DIR, filename).read_bytes()
+    if filename.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"zstandard is required to read {filename}")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    else:
+        data = gzip.decompress(data)
+    return _loads(data)
+
+def _store_status_blobs(status_update, version):
+    """
+    Move the large values in a status update out to blob files
+    
+    Replaces each STATUS_BLOB_KEYS value in status_update with a pointer and
+    removes the blob the previous status pointed to.
+    
+    Args:
+        status_update (dict): Status values to be written (modified in place)
+        version (str): Suffix for the blob file names
+    """
+    keys = [key for key in STATUS_BLOB_KEYS if key in status_update]
+    if not keys:
+        return
+    
+    previous = load_status(keys)
+    for key in keys:
+        status_update[key] = _write_status_blob(f"{STATUS_BLOB_KEYS[key]}_{version}", status_update[key])
+        
+        old_ref = previous.get(key)
+        if isinstance(old_ref, dict) and old_ref.get("$ref") not in (None, status_update[key]["$ref"]):
+            try:
+                os.remove(os.path.join(STATUS_BLOB_DIR, old_ref["$ref"]))
+            except OSError:
+                pass
+
+# Open connection to STATUS_DB, created on first use
+_status_conn = None
+
+def _status_db():
+    """Return the status database connection, creating the table and migrating legacy JSON on first use"""
+    global _status_conn
+    if _status_conn is None:
+        conn = sqlite3.connect(STATUS_DB)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS status (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        _migrate_status_file(conn)
+        _status_conn = conn
+    return _status_conn
+
+def _migrate_status_file(conn):
+    """Import the legacy JSON status file into an empty status table, then set it aside"""
+    if not os.path.exists(STATUS_FILE):
+        return
+    
+    if conn.execute("SELECT 1 FROM status LIMIT 1").fetchone() is None:
+        legacy_status = _read_json_cached(STATUS_FILE, {})
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO status (key, value) VALUES (?, ?)",
+                [(key, _dumps(value)) for key, value in legacy_status.items()]
+            )
+        logger.info("Migrated %d status entries to %s", len(legacy_status), STATUS_DB)
+    
+    os.replace(STATUS_FILE, STATUS_FILE + ".migrated")
+    _json_cache.pop(STATUS_FILE, None)
+
+def load_status(keys=None):
+    """
+    Load stored training status
+    
+    Args:
+        keys (tuple): Only load these keys (default: all)
+        
+    Returns:
+        dict: Status values by key
+    """
+    conn = _status_db()
+    if keys is None:
+        rows = conn.execute("SELECT key, value FROM status ORDER BY key")
+    else:
+        placeholders = ",".join("?" * len(keys))
+        rows = conn.execute(f"SELECT key, value FROM status WHERE key IN ({placeholders})", tuple(keys))
+    return {key: _loads(value) for key, value in rows}
+
 def load_config():
     """
     Load the configuration for scheduled training
@@ -58,21 +287,20 @@ def load_config():
     config = DEFAULT_CONFIG.copy()
     
     # Override with values from config file if it exists
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-                file_config = json.load(f)
-                
+    try:
+        file_config = _read_json_cached(CONFIG_FILE)
+    except Exception as e:
+        logger.error("Error loading configuration: %s", e)
+    else:
+        if file_config is not None:
             # Update config with file values
             config.update(file_config)
             
             logger.info("Loaded configuration from file")
-        except Exception as e:
-            logger.error(f"Error loading configuration: {e}")
-    else:
-        # Save default config
-        save_config(config)
-        logger.info("Created default configuration file")
+        else:
+            # Save default config
+            save_config(config)
+            logger.info("Created default configuration file")
     
     return config
 
@@ -87,64 +315,120 @@ def save_config(config):
         bool: Success status
     """
     try:
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        _dump_json(config, CONFIG_FILE)
             
         logger.info("Saved configuration to file")
         return True
     except Exception as e:
-        logger.error(f"Error saving configuration: {e}")
+        logger.error("Error saving configuration: %s", e)
         return False
 
-def update_status(status):
+def update_status(status, now=None):
     """
     Update the status file with latest training information
     
     Args:
         status (dict): The status information to save
+        now (datetime, optional): Timestamp to record as last_updated
         
     Returns:
         bool: Success status
     """
     try:
-        # Load existing status if file exists
-        existing_status = {}
-        if os.path.exists(STATUS_FILE):
-            with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-                existing_status = json.load(f)
-        
-        # Update with new status
-        existing_status.update(status)
+        if now is None:
+            now = datetime.datetime.now()
         
-        # Add timestamp
-        existing_status["last_updated"] = datetime.datetime.now().isoformat()
+        # Only the given keys (plus the timestamp) are written, in one transaction
+        rows = dict(status, last_updated=now.isoformat())
         
-        # Save updated status
-        with open(STATUS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(existing_status, f, indent=2, ensure_ascii=False)
+        conn = _status_db()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO status (key, value) VALUES (?, ?)",
+                [(key, _dumps(value)) for key, value in rows.items()]
+            )
             
-        logger.info("Updated status file")
+        logger.info("Updated status")
         return True
     except Exception as e:
-        logger.error(f"Error updating status: {e}")
+        logger.error("Error updating status: %s", e)
         return False
 
-def get_next_training_time(config):
+# ISO timestamps seen in config/status are few and repeat on every check
+_parse_iso = lru_cache(maxsize=32)(datetime.datetime.fromisoformat)
+
+# Last read of last_training_time: ((db mtime_ns, wal mtime_ns), value)
+_last_training_cache = (None, None)
+
+def _status_db_stamp():
+    """Return the mtimes of the status database and its WAL, which change on every write"""
+    stamp = []
+    for path in (STATUS_DB, STATUS_DB + "-wal"):
+        try:
+            stamp.append(os.stat(path).st_mtime_ns)
+        except FileNotFoundError:
+            stamp.append(None)
+    return tuple(stamp)
+
+def _last_training_time():
+    """Return the stored last_training_time, re-reading it only after the status database changes"""
+    global _last_training_cache
+    
+    stamp = _status_db_stamp()
+    if _last_training_cache[0] != stamp:
+        value = load_status(("last_training_time",)).get("last_training_time")
+        # Opening the database can create or migrate files, so stamp after reading
+        _last_training_cache = (_status_db_stamp(), value)
+    return _last_training_cache[1]
+
+# Training interval in seconds for each named frequency ("monthly" is ~30 days here;
+# get_next_training_time schedules it on the same day of the next month)
+_FREQ_SECONDS = {
+    "daily": 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+    "monthly": 30 * 24 * 60 * 60
+}
+
+def _freq_seconds(frequency, default=_FREQ_SECONDS["daily"]):
+    """
+    Convert a frequency setting to an interval in seconds
+    
+    Args:
+        frequency (str): 'daily', 'weekly', 'monthly' or a number of hours
+        default (int): Interval used when the frequency is invalid
+        
+    Returns:
+        int: Interval in seconds
+    """
+    try:
+        return _FREQ_SECONDS[frequency]
+    except KeyError:
+        pass
+    
+    try:
+        return int(frequency) * 60 * 60
+    except (TypeError, ValueError):
+        logger.warning("Invalid frequency format: %s. Using daily instead.", frequency)
+        return default
+
+def get_next_training_time(config, now=None):
     """
     Calculate the next scheduled training time
     
     Args:
         config (dict): The training configuration
+        now (datetime, optional): Current time, if already known
         
     Returns:
         datetime: The next training time
     """
-    now = datetime.datetime.now()
+    if now is None:
+        now = datetime.datetime.now()
     
     # If next_training_time is specified in config and it's in the future, use it
     if config.get("next_training_time"):
         try:
-            next_time = datetime.datetime.fromisoformat(config["next_training_time"])
+            next_time = _parse_iso(config["next_training_time"])
             if next_time > now:
                 return next_time
         except:
@@ -153,15 +437,7 @@ def get_next_training_time(config):
     # Otherwise, calculate based on frequency
     frequency = config.get("frequency", "weekly")
     
-    if frequency == "daily":
-        # Next day, same time
-        return now + datetime.timedelta(days=1)
-    
-    elif frequency == "weekly":
-        # Next week, same day and time
-        return now + datetime.timedelta(days=7)
-    
-    elif frequency == "monthly":
+    if frequency == "monthly":
         # Next month, same day and time (approximately)
         if now.month == 12:
             next_month = 1
@@ -170,57 +446,28 @@ def get_next_training_time(config):
             next_month = now.month + 1
             next_year = now.year
             
-        # Handle month length differences
-        try:
-            next_date = datetime.datetime(
-                year=next_year, 
-                month=next_month, 
-                day=now.day,
-                hour=now.hour, 
-                minute=now.minute
-            )
-        except ValueError:
-            # Handle cases like February 30 by using last day of month
-            if next_month == 2:
-                if next_year % 4 == 0 and (next_year % 100 != 0 or next_year % 400 == 0):
-                    # Leap year
-                    day = min(now.day, 29)
-                else:
-                    day = min(now.day, 28)
-            else:
-                # Other months with fewer than 31 days
-                month_days = {
-                    1: 31, 2: 28, 3: 31, 4: 30, 5: 31, 6: 30,
-                    7: 31, 8: 31, 9: 30, 10: 31, 11: 30, 12: 31
-                }
-                day = min(now.day, month_days[next_month])
-                
-            next_date = datetime.datetime(
-                year=next_year, 
-                month=next_month, 
-                day=day,
-                hour=now.hour, 
-                minute=now.minute
-            )
+        # Same day of month, clamped to the month's length (e.g. Jan 31 -> Feb 28/29)
+        day = min(now.day, calendar.monthrange(next_year, next_month)[1])
+        next_date = datetime.datetime(
+            year=next_year, 
+            month=next_month, 
+            day=day,
+            hour=now.hour, 
+            minute=now.minute
+        )
             
         return next_date
     
-    else:
-        # Try to interpret as number of hours
-        try:
-            hours = int(frequency)
-            return now + datetime.timedelta(hours=hours)
-        except:
-            # Default to daily if frequency is invalid
-            logger.warning(f"Invalid frequency format: {frequency}. Using daily instead.")
-            return now + datetime.timedelta(days=1)
+    # Daily, weekly or a number of hours: same time of day after the interval
+    return now + datetime.timedelta(seconds=_freq_seconds(frequency))
 
-def should_train_now(config):
+def should_train_now(config, now=None):
     """
     Check if it's time to train based on the configuration
     
     Args:
         config (dict): The training configuration
+        now (datetime, optional): Current time, if already known
         
     Returns:
         bool: True if it's time to train, False otherwise
@@ -228,58 +475,107 @@ def should_train_now(config):
     if not config.get("enabled", True):
         return False
     
+    if now is None:
+        now = datetime.datetime.now()
+    
     # Check if next_training_time is set and we've reached or passed it
     if config.get("next_training_time"):
         try:
-            next_time = datetime.datetime.fromisoformat(config["next_training_time"])
-            return datetime.datetime.now() >= next_time
+            next_time = _parse_iso(config["next_training_time"])
+            return now >= next_time
         except:
             # Invalid format, fall back to calculating based on last training
             pass
     
     # If no specific next time or invalid format, check based on last training
-    status = {}
-    if os.path.exists(STATUS_FILE):
-        try:
-            with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-                status = json.load(f)
-        except:
-            pass
+    last_training = None
+    try:
+        last_training = _last_training_time()
+    except:
+        pass
     
-    last_training = status.get("last_training_time")
     if not last_training:
         # If no previous training, we should train now
         return True
     
     try:
-        last_time = datetime.datetime.fromisoformat(last_training)
-        frequency = config.get("frequency", "weekly")
+        last_time = _parse_iso(last_training)
         
         # Calculate time elapsed since last training
-        elapsed = datetime.datetime.now() - last_time
-        
-        if frequency == "daily":
-            return elapsed.total_seconds() >= 24 * 60 * 60  # 24 hours
-        
-        elif frequency == "weekly":
-            return elapsed.total_seconds() >= 7 * 24 * 60 * 60  # 7 days
-        
-        elif frequency == "monthly":
-            return elapsed.total_seconds() >= 30 * 24 * 60 * 60  # ~30 days
-        
-        else:
-            # Try to interpret as number of hours
-            try:
-                hours = int(frequency)
-                return elapsed.total_seconds() >= hours * 60 * 60
-            except:
-                # Default to daily if frequency is invalid
-                return elapsed.total_seconds() >= 24 * 60 * 60  # 24 hours
+        elapsed = now - last_time
+        return elapsed.total_seconds() >= _freq_seconds(config.get("frequency", "weekly"))
     
     except:
         # If we can't parse last training time, assume we should train
         return True
 
+def _training_not_due():
+    """
+    Check the next-training stamp without reading the config or status
+    
+    Returns:
+        bool: True if the stamp's deadline is still in the future and the
+            config has not changed since the stamp was written
+    """
+    try:
+        stamp = os.stat(NEXT_TRAINING_STAMP)
+    except OSError:
+        return False
+    
+    try:
+        config_mtime_ns = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError:
+        config_mtime_ns = 0
+    
+    # The stamp's ctime is when its deadline was set (os.utime updates it)
+    return time.time() < stamp.st_mtime and config_mtime_ns <= stamp.st_ctime_ns
+
+def _write_next_training_stamp(next_time):
+    """
+    Record the next training time as the mtime of NEXT_TRAINING_STAMP
+    
+    Args:
+        next_time (datetime): The next scheduled training time
+    """
+    try:
+        epoch = next_time.timestamp()
+        with open(NEXT_TRAINING_STAMP, "a"):
+            pass
+        os.utime(NEXT_TRAINING_STAMP, (epoch, epoch))
+    except (OSError, OverflowError, ValueError) as e:
+        logger.warning("Could not write next training stamp: %s", e)
+
+# Training and feedback entry points, bound by _load_training_modules() on first use
+train_and_evaluate_model = None
+analyze_training_trends = None
+analyze_model_errors = None
+analyze_and_incorporate_feedback = None
+
+def _load_training_modules():
+    """
+    Import the training and feedback entry points once
+    
+    model_training pulls in scikit-learn and loads the intent model, which the
+    frequent no-op "check" runs never need, so it is not imported at module
+    level. Raises ImportError if model_training is unavailable; the feedback
+    system is optional and stays None when missing.
+    """
+    global train_and_evaluate_model, analyze_training_trends, analyze_model_errors
+    global analyze_and_incorporate_feedback
+    
+    if train_and_evaluate_model is None:
+        from model_training import (
+            train_and_evaluate_model,
+            analyze_training_trends,
+            analyze_model_errors
+        )
+    
+    if analyze_and_incorporate_feedback is None:
+        try:
+            from chatbot.feedback_system import analyze_and_incorporate_feedback
+        except ImportError:
+            pass
+
 def run_training():
     """
     Run the training process
@@ -287,37 +583,41 @@ def run_training():
     Returns:
         dict: Results of the training process
     """
+    # One timestamp for the start of the run (status, model version) and one
+    # for its end (next training time, final status)
+    started = datetime.datetime.now()
+    
+    # Status changes for this run, written once when it starts (so the status
+    # action shows it in progress) and once with everything at the end
+    pending_status = {
+        "last_training_time": started.isoformat(),
+        "training_status": "in_progress"
+    }
+    
     try:
         # Import model training module
-        sys.path.append(SCRIPT_DIR)
-        from model_training import (
-            train_and_evaluate_model, 
-            analyze_training_trends, 
-            analyze_model_errors
-        )
+        _load_training_modules()
         
         # Load config
         config = load_config()
         
         # Update status
-        update_status({
-            "last_training_time": datetime.datetime.now().isoformat(),
-            "training_status": "in_progress"
-        })
+        update_status(pending_status, now=started)
         
         # First, incorporate feedback if enabled
         if config.get("incorporate_feedback", True):
-            try:
-                from chatbot.feedback_system import analyze_and_incorporate_feedback
-                feedback_results = analyze_and_incorporate_feedback()
-                logger.info(f"Incorporated feedback: {feedback_results.get('new_added', 0)} new examples added")
-            except ImportError:
+            if analyze_and_incorporate_feedback is None:
                 logger.warning("Feedback system not available, skipping feedback incorporation")
-            except Exception as e:
-                logger.error(f"Error incorporating feedback: {e}")
+            else:
+                try:
+                    feedback_results = analyze_and_incorporate_feedback()
+                    logger.info("Incorporated feedback: %d new examples added",
+                                feedback_results.get('new_added', 0))
+                except Exception as e:
+                    logger.error("Error incorporating feedback: %s", e)
         
         # Train and evaluate the model
-        version = datetime.datetime.now().strftime("%Y%m%d")
+        version = started.strftime("%Y%m%d")
         training_results = train_and_evaluate_model(
             test_size=config.get("test_size", 0.2),
             save_model=True,
@@ -328,51 +628,68 @@ def run_training():
         training_status = "completed" if "success" in training_results else "failed"
         training_metrics = training_results.get("metrics", {})
         
-        status_update = {
+        status_update = pending_status
+        status_update.update({
             "training_status": training_status,
             "training_metrics": training_metrics
-        }
-        
-        # Run trend analysis if enabled
-        if config.get("analyze_trends", True):
-            try:
-                trends = analyze_training_trends()
-                status_update["training_trends"] = trends
-                logger.info(f"Trend analysis completed")
-            except Exception as e:
-                logger.error(f"Error analyzing trends: {e}")
-        
-        # Run error analysis if enabled
-        if config.get("analyze_errors", True):
-            try:
-                error_analysis = analyze_model_errors(best_model=False)  # Use the model we just trained
-                status_update["error_analysis"] = error_analysis
-                logger.info(f"Error analysis completed")
-            except Exception as e:
-                logger.error(f"Error analyzing errors: {e}")
+        })
         
-        # Clean up old models if enabled
-        if config.get("cleanup_old_models", True):
-            try:
+        # Trend analysis, error analysis and cleanup are independent of each
+        # other once training is done, so run them concurrently. Each entry maps
+        # a future to (status key, description for errors, completion message).
+        steps = {}
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            if config.get("analyze_trends", True):
+                steps[executor.submit(analyze_training_trends)] = (
+                    "training_trends", "analyzing trends", "Trend analysis completed")
+            
+            if config.get("analyze_errors", True):
+                # Use the model we just trained
+                steps[executor.submit(analyze_model_errors, best_model=False)] = (
+                    "error_analysis", "analyzing errors", "Error analysis completed")
+            
+            if config.get("cleanup_old_models", True):
                 keep_models = config.get("keep_models", 5)
-                cleanup_old_models(keep_models)
-            except Exception as e:
-                logger.error(f"Error cleaning up old models: {e}")
+                max_size_mb = config.get("max_model_cache_mb")
+                steps[executor.submit(cleanup_old_models, keep_models, max_size_mb)] = (
+                    None, "cleaning up old models", None)
+            
+            for future in as_completed(steps):
+                key, action, completed_message = steps[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Error %s: %s", action, e)
+                    continue
+                
+                if key is not None:
+                    status_update[key] = result
+                if completed_message:
+                    logger.info(completed_message)
+        
+        # Keep the analyses out of the status database
+        try:
+            _store_status_blobs(status_update, started.strftime("%Y%m%d_%H%M%S"))
+        except Exception as e:
+            logger.error("Error storing analysis results: %s", e)
+            for key in STATUS_BLOB_KEYS:
+                status_update.pop(key, None)
         
         # Calculate next training time
-        next_training_time = get_next_training_time(config)
+        finished = datetime.datetime.now()
+        next_training_time = get_next_training_time(config, now=finished)
         config["next_training_time"] = next_training_time.isoformat()
         save_config(config)
         
         status_update["next_training_time"] = config["next_training_time"]
-        update_status(status_update)
+        update_status(status_update, now=finished)
         
         # Send notification if configured
         if config.get("notification_email"):
             try:
                 send_notification(config["notification_email"], training_results, status_update)
             except Exception as e:
-                logger.error(f"Error sending notification: {e}")
+                logger.error("Error sending notification: %s", e)
         
         return {
             "success": "success" in training_results,
@@ -380,47 +697,65 @@ def run_training():
         }
         
     except Exception as e:
-        logger.error(f"Error running training: {e}")
-        update_status({
+        logger.error("Error running training: %s", e)
+        pending_status.update({
             "training_status": "failed",
             "error": str(e)
         })
+        update_status(pending_status)
         return {"error": str(e)}
 
-def cleanup_old_models(keep=5):
+def cleanup_old_models(keep=5, max_size_mb=None):
     """
     Remove old model files, keeping only the most recent ones
     
     Args:
         keep (int): Number of models to keep
+        max_size_mb (float, optional): Total size budget for the kept models;
+            the oldest survivors are removed until it is met (the newest model
+            is always kept)
         
     Returns:
         int: Number of models removed
     """
     try:
-        # Get all model files
-        model_files = []
-        for file in os.listdir(MODEL_DIR):
-            if file.startswith("intent_model_") and file.endswith(".pkl"):
-                path = os.path.join(MODEL_DIR, file)
-                stat = os.stat(path)
-                model_files.append((path, stat.st_mtime))
-        
-        # Sort by modification time (newest first)
-        model_files.sort(key=lambda x: x[1], reverse=True)
-        
-        # Keep the specified number of models
-        models_to_remove = model_files[keep:]
-        
-        # Remove old models
-        for path, _ in models_to_remove:
-            os.remove(path)
-            logger.info(f"Removed old model: {path}")
+        # Get all model files (scandir entries come with their type, and stat
+        # results are cached on the entry)
+        with os.scandir(MODEL_DIR) as entries:
+            model_files = [
+                (entry.path, entry.stat().st_mtime, entry.stat().st_size) for entry in entries
+                if entry.name.startswith("intent_model_") and entry.name.endswith(".pkl")
+                and entry.is_file(follow_symlinks=False)
+            ]
+        
+        # Keep the specified number of newest models without sorting them all
+        newest = heapq.nlargest(keep, model_files, key=lambda x: x[1])
+        
+        # Drop the oldest survivors until the rest fit in the size budget
+        if max_size_mb is not None and newest:
+            budget = max_size_mb * 1024 * 1024
+            total_size = sum(size for _, _, size in newest)
+            while len(newest) > 1 and total_size > budget:
+                total_size -= newest.pop()[2]
+        
+        survivors = {path for path, _, _ in newest}
+        models_to_remove = [item for item in model_files if item[0] not in survivors]
+        
+        # Remove old models, logging a single summary line
+        removed_paths = []
+        try:
+            for path, _, _ in models_to_remove:
+                os.remove(path)
+                removed_paths.append(path)
+        finally:
+            if removed_paths:
+                logger.info("Removed %d old models: %s", len(removed_paths),
+                            ", ".join(os.path.basename(p) for p in removed_paths))
         
-        return len(models_to_remove)
+        return len(removed_paths)
         
     except Exception as e:
-        logger.error(f"Error cleaning up old models: {e}")
+        logger.error("Error cleaning up old models: %s", e)
         return 0
 
 def send_notification(email, training_results, status_update):
@@ -440,11 +775,14 @@ def send_notification(email, training_results, status_update):
     # 2. Or integrate with a notification service like SendGrid, Mailgun, etc.
     # 3. Or use a cloud service's notification mechanism
     
-    logger.info(f"Would send notification to {email} if implemented")
+    logger.info("Would send notification to %s if implemented", email)
     return True
 
-def main():
-    """Process command line arguments and run requested actions"""
+# Command line parser, built on first use by main()
+_PARSER = None
+
+def _build_parser():
+    """Build the command line argument parser"""
     parser = argparse.ArgumentParser(description="Scheduled training for chatbot ML model")
     
     parser.add_argument(
@@ -484,7 +822,27 @@ def main():
         help="Set notification email address"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--details",
+        action="store_true",
+        help="Include detailed metrics and analyses in the status output"
+    )
+    
+    return parser
+
+def main():
+    """Process command line arguments and run requested actions"""
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    
+    args = _PARSER.parse_args()
+    
+    # Most cron "check" runs find nothing due; answer those from the stamp
+    # alone, before any config or status is parsed
+    changes_config = args.frequency or args.enable or args.disable or args.email
+    if args.action == "check" and not (args.force or changes_config) and _training_not_due():
+        return
     
     # Load existing configuration
     config = load_config()
@@ -523,12 +881,10 @@ def main():
     elif args.action == "status":
         # Display current status
         status = {}
-        if os.path.exists(STATUS_FILE):
-            try:
-                with open(STATUS_FILE, 'r', encoding='utf-8') as f:
-                    status = json.load(f)
-            except:
-                pass
+        try:
+            status = load_status()
+        except:
+            pass
         
         print("\nTraining Status:")
         if not status:
@@ -536,7 +892,16 @@ def main():
         else:
             for key, value in status.items():
                 if key == "training_metrics" or key == "training_trends" or key == "error_analysis":
-                    print(f"  {key}: [detailed information available]")
+                    if not args.details:
+                        print(f"  {key}: [detailed information available]")
+                        continue
+                    
+                    # Analyses are only read from their blob files when asked for
+                    try:
+                        value = _read_status_blob(value)
+                    except Exception as e:
+                        value = f"[unavailable: {e}]"
+                    print(f"  {key}: {json.dumps(value, indent=2, default=str)}")
                 else:
                     print(f"  {key}: {value}")
     
@@ -546,18 +911,19 @@ def main():
         results = run_training()
         
         if "error" in results:
-            logger.error(f"Training failed: {results['error']}")
+            logger.error("Training failed: %s", results['error'])
         else:
             logger.info("Training completed successfully")
     
     elif args.action == "check":
         # Check if training should run
-        if should_train_now(config) or args.force:
+        now = datetime.datetime.now()
+        if should_train_now(config, now) or args.force:
             logger.info("It's time to train the model")
             results = run_training()
             
             if "error" in results:
-                logger.error(f"Training failed: {results['error']}")
+                logger.error("Training failed: %s", results['error'])
             else:
                 logger.info("Training completed successfully")
         else:
@@ -567,16 +933,19 @@ def main():
             next_time = None
             if config.get("next_training_time"):
                 try:
-                    next_time = datetime.datetime.fromisoformat(config["next_training_time"])
+                    next_time = _parse_iso(config["next_training_time"])
                 except:
-                    next_time = get_next_training_time(config)
+                    next_time = get_next_training_time(config, now)
+                else:
+                    # This is the deadline should_train_now checked against
+                    _write_next_training_stamp(next_time)
             else:
-                next_time = get_next_training_time(config)
+                next_time = get_next_training_time(config, now)
             
             if next_time:
-                time_until = next_time - datetime.datetime.now()
-                logger.info(f"Next training scheduled for: {next_time.isoformat()}")
-                logger.info(f"Time until next training: {time_until}")
+                time_until = next_time - now
+                logger.info("Next training scheduled for: %s", next_time.isoformat())
+                logger.info("Time until next training: %s", time_until)
     
     logger.info("Script execution complete")
 
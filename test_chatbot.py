@@ -12,6 +12,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger("chatbot_test")
 
+def format_exchanges(messages, responses, bot_name):
+    """Format test exchanges as one block so they can be written in a single call"""
+    separator = "-" * 40
+    out = []
+    for message, response in zip(messages, responses):
+        out.append(f"User: {message}\n{bot_name}: {response}\n{separator}\n")
+    return "".join(out)
+
 def main():
     """Test basic chatbot functionality"""
     print("\n===== CHATBOT FUNCTIONALITY TEST =====\n")
@@ -42,11 +50,7 @@ def main():
     greetings = ["hi", "hello", "hey", "greetings", "howdy", "what's up", "hola", "hi there", "hello!"]
     
     print(f"\nTesting greetings with {bot_name}:\n")
-    for greeting in greetings:
-        response = chatbot.respond(greeting)
-        print(f"User: {greeting}")
-        print(f"{bot_name}: {response}")
-        print("-" * 40)
+    sys.stdout.write(format_exchanges(greetings, chatbot.respond_many(greetings), bot_name))
     
     # Test a few other common patterns
     other_tests = [
@@ -59,11 +63,7 @@ def main():
     ]
     
     print(f"\nTesting other patterns with {bot_name}:\n")
-    for test in other_tests:
-        response = chatbot.respond(test)
-        print(f"User: {test}")
-        print(f"{bot_name}: {response}")
-        print("-" * 40)
+    sys.stdout.write(format_exchanges(other_tests, chatbot.respond_many(other_tests), bot_name))
     
     print("\nTest completed. Check responses above to verify functionality.")
     return 0
@@ -12,6 +12,142 @@ logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger("chatbot_trainer")
 
+# NLTK resources used by the intent classifier's preprocessing
+NLTK_RESOURCES = ('tokenizers/punkt', 'corpora/wordnet', 'corpora/stopwords')
+
+# Resources already located by nltk.data.find in this process
+_found_nltk_resources = set()
+
+def _nltk_ready(nltk_data_dir):
+    """Return True if download_nltk_data.py left its installation marker"""
+    return os.path.exists(os.path.join(nltk_data_dir, 'NLTK_INSTALLED'))
+
+def _missing_nltk_resources(nltk):
+    """Probe each required resource once per process and return the ones not found"""
+    missing = []
+    for resource in NLTK_RESOURCES:
+        if resource in _found_nltk_resources:
+            continue
+        try:
+            nltk.data.find(resource)
+            _found_nltk_resources.add(resource)
+        except LookupError:
+            missing.append(resource)
+    return missing
+
+def prepare_nltk(script_dir):
+    """
+    Put the project's NLTK data directory first on nltk.data.path
+    
+    Args:
+        script_dir (str): Project root containing nltk_data/
+        
+    Returns:
+        bool: False if the NLTK data directory is missing
+    """
+    nltk_data_dir = os.path.join(script_dir, "nltk_data")
+    if not os.path.exists(nltk_data_dir):
+        logger.error("NLTK data directory not found at: %s", nltk_data_dir)
+        logger.error("Please run the download_nltk_data.py script first:")
+        logger.error("python download_nltk_data.py")
+        return False
+    
+    import nltk
+    if nltk_data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, nltk_data_dir)
+    logger.info("Added NLTK data path: %s", nltk_data_dir)
+    
+    # The installation marker makes probing the individual resources unnecessary
+    if _nltk_ready(nltk_data_dir):
+        logger.info("NLTK data installation verified")
+    else:
+        missing = _missing_nltk_resources(nltk)
+        if missing:
+            logger.warning("NLTK data directory exists but is missing: %s", ', '.join(missing))
+            logger.warning("Consider running download_nltk_data.py again")
+        else:
+            logger.info("NLTK data resources found")
+    return True
+
+def ensure_training_data(script_dir):
+    """
+    Make sure readable intent training data exists, creating sample data otherwise
+    
+    Args:
+        script_dir (str): Project root containing data/
+        
+    Returns:
+        str: Path to the training data file
+    """
+    from chatbot.ml_engine import create_sample_training_data
+    
+    data_dir = os.path.join(script_dir, "data")
+    training_data_path = os.path.join(data_dir, "intent_training_data.json")
+    
+    if not os.path.exists(training_data_path):
+        logger.info("Training data not found, creating sample data")
+        create_sample_training_data()
+    else:
+        logger.info("Found existing training data at %s", training_data_path)
+        
+        # Check the data format
+        try:
+            with open(training_data_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            logger.info("Training data contains %d examples", len(data))
+        except Exception as e:
+            logger.error("Error checking training data: %s", e)
+            logger.info("Creating new sample data")
+            create_sample_training_data()
+    
+    return training_data_path
+
+def run_training_pipeline():
+    """
+    Train the intent classifier and try it on a few sample messages
+    
+    Returns:
+        dict: Training results from intent_classifier.train() (with an 'error' key on failure)
+    """
+    from chatbot.ml_engine import intent_classifier
+    
+    # Train the model
+    logger.info("Training intent classifier model")
+    start_time = datetime.now()
+    results = intent_classifier.train()
+    duration = (datetime.now() - start_time).total_seconds()
+    
+    if "error" in results:
+        logger.error("Training failed: %s", results['error'])
+        return results
+        
+    # Log results
+    logger.info("Model trained successfully in %.2f seconds", duration)
+    logger.info("Accuracy: %.4f", results['accuracy'])
+    logger.info("Best parameters: %s", results['best_params'])
+    
+    # Test the model
+    test_messages = [
+        "hi there",
+        "what's the weather in New York",
+        "bye for now",
+        "thanks a lot",
+        "what's your name",
+        "my name is John",
+        "what can you do"
+    ]
+    
+    # The sample predictions are only for the log, so skip them when INFO is off
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("\nTesting model with sample messages:")
+        for message in test_messages:
+            prediction = intent_classifier.predict(message)
+            logger.info("Message: '%s'", message)
+            logger.info("Intent: %s (confidence: %.2f)", prediction['intent'], prediction['confidence'])
+            logger.info("---")
+    
+    return results
+
 def main():
     """Train the chatbot ML model"""
     
@@ -23,91 +159,21 @@ def main():
         sys.path.append(script_dir)
     
     # First, set up the NLTK data path
-    nltk_data_dir = os.path.join(script_dir, "nltk_data")
-    if os.path.exists(nltk_data_dir):
-        import nltk
-        if nltk_data_dir not in nltk.data.path:
-            nltk.data.path.insert(0, nltk_data_dir)
-        logger.info(f"Added NLTK data path: {nltk_data_dir}")
-        
-        # Check for installation marker
-        if os.path.exists(os.path.join(nltk_data_dir, 'NLTK_INSTALLED')):
-            logger.info("NLTK data installation verified")
-        else:
-            logger.warning("NLTK data directory exists but may not be complete")
-            logger.warning("Consider running download_nltk_data.py again")
-    else:
-        logger.error(f"NLTK data directory not found at: {nltk_data_dir}")
-        logger.error("Please run the download_nltk_data.py script first:")
-        logger.error("python download_nltk_data.py")
+    if not prepare_nltk(script_dir):
         return 1
     
     try:
-        # Import ML engine
-        from chatbot.ml_engine import intent_classifier, create_sample_training_data
-        
-        # Check if we need to create sample data
-        data_dir = os.path.join(script_dir, "data")
-        training_data_path = os.path.join(data_dir, "intent_training_data.json")
-        
-        if not os.path.exists(training_data_path):
-            logger.info("Training data not found, creating sample data")
-            create_sample_training_data()
-        else:
-            logger.info(f"Found existing training data at {training_data_path}")
-            
-            # Check the data format
-            try:
-                with open(training_data_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                logger.info(f"Training data contains {len(data)} examples")
-            except Exception as e:
-                logger.error(f"Error checking training data: {e}")
-                logger.info("Creating new sample data")
-                create_sample_training_data()
-        
-        # Train the model
-        logger.info("Training intent classifier model")
-        start_time = datetime.now()
-        results = intent_classifier.train()
-        duration = (datetime.now() - start_time).total_seconds()
-        
-        if "error" in results:
-            logger.error(f"Training failed: {results['error']}")
-            return 1
-            
-        # Log results
-        logger.info(f"Model trained successfully in {duration:.2f} seconds")
-        logger.info(f"Accuracy: {results['accuracy']:.4f}")
-        logger.info(f"Best parameters: {results['best_params']}")
-        
-        # Test the model
-        test_messages = [
-            "hi there",
-            "what's the weather in New York",
-            "bye for now",
-            "thanks a lot",
-            "what's your name",
-            "my name is John",
-            "what can you do"
-        ]
-        
-        logger.info("\nTesting model with sample messages:")
-        for message in test_messages:
-            prediction = intent_classifier.predict(message)
-            logger.info(f"Message: '{message}'")
-            logger.info(f"Intent: {prediction['intent']} (confidence: {prediction['confidence']:.2f})")
-            logger.info("---")
-            
-        return 0
+        ensure_training_data(script_dir)
+        results = run_training_pipeline()
+        return 1 if "error" in results else 0
         
     except ImportError as e:
-        logger.error(f"Failed to import required modules: {e}")
+        logger.error("Failed to import required modules: %s", e)
         logger.error("Make sure you have scikit-learn and nltk installed")
         return 1
         
     except Exception as e:
-        logger.error(f"Unexpected error: {e}")
+        logger.error("Unexpected error: %s", e)
         return 1
 
 if __name__ == "__main__":
@@ -2,8 +2,17 @@
 # A demonstration script showing how to use speech recognition and speech synthesis
 # with the chatbot (for reference and testing purposes)
 
+import os
+import re
+import queue
 import sys
+import time
+import hashlib
 import logging
+import sqlite3
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -15,6 +24,9 @@ try:
     import speech_recognition as sr
     import pyttsx3
 except ImportError as e:
+    # Only exit with installation help when run as a script
+    if __name__ != "__main__":
+        raise
     missing_lib = str(e).split("'")[1]
     logger.error(f"Required library not found: {missing_lib}")
     print(f"\nError: Missing required library: {missing_lib}")
@@ -26,23 +38,890 @@ except ImportError as e:
     print("\nAfter installing the dependencies, try running this script again.")
     sys.exit(1)
 
-# Now import the chatbot module
-from chatbot.chatbot import ImprovedChat, pairs, reflections, bot_name
+# sentence-transformers is optional; it lets paraphrased questions reuse earlier answers
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+# Playing pre-rendered WAV files needs simpleaudio, or winsound on Windows;
+# without either every phrase is synthesized when it is spoken
+try:
+    import simpleaudio
+except ImportError:
+    simpleaudio = None
+
+try:
+    import winsound
+except ImportError:
+    winsound = None
+
+# Piper and sounddevice are optional; with a downloaded voice model they replace
+# the system TTS engine with faster neural synthesis
+try:
+    import numpy as np
+    import sounddevice
+    from piper.voice import PiperVoice
+except ImportError:
+    PiperVoice = None
+
+# webrtcvad is optional; it ends each recording as soon as speech stops
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+# faster-whisper is optional; it transcribes locally, with no network round trip
+try:
+    import numpy as np
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+# google-cloud-speech is optional; it keeps one gRPC channel open for the whole
+# session instead of a new HTTPS request per utterance
+try:
+    from google.cloud import speech as cloud_speech
+    from google.api_core import exceptions as google_exceptions
+except ImportError:
+    cloud_speech = None
+
+# Responses and rendered speech are kept across sessions
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESPONSE_DB = os.path.join(SCRIPT_DIR, "data", "voice_demo_cache.sqlite")
+SPEECH_CACHE_DIR = os.path.join(SCRIPT_DIR, "data", "voice_demo_speech")
+PIPER_VOICE = os.environ.get(
+    "PIPER_VOICE", os.path.join(SCRIPT_DIR, "data", "voices", "en_US-lessac-medium.onnx")
+)
+
+# Fixed phrases spoken by the demo
+FAREWELL_MSG = "Goodbye! Have a great day!"
+NOT_UNDERSTOOD_MSG = "Sorry, I couldn't understand what you said. Could you try again?"
+SPEECH_SERVICE_ERROR_MSG = "Sorry, there was an error with the speech service."
+
+# The microphone energy threshold is measured once and kept fixed, then
+# re-measured after this many turns or this many unrecognized utterances in a row
+CALIBRATION_INTERVAL = 20
+MAX_MISSES_BEFORE_CALIBRATION = 2
+
+# Piper synthesis requests arriving within this window of each other are
+# handled as one batch
+MICRO_BATCH_WINDOW_MS = float(os.environ.get("MICRO_BATCH_WINDOW_MS", "5"))
+
+# How often speech playback checks whether it has finished or been interrupted
+SPEECH_POLL_SECONDS = 0.01
+
+# The listener waits at most this long for speech to start before checking
+# whether it should stop; utterances are cut off after PHRASE_TIME_LIMIT seconds
+LISTEN_POLL_SECONDS = 1.0
+PHRASE_TIME_LIMIT = 5
+
+# Voice activity detection (with webrtcvad): audio is classified in frames of
+# VAD_FRAME_MS at VAD_SAMPLE_RATE; a recording ends after END_SILENCE_MS of
+# non-speech and keeps SPEECH_PAD_MS of audio from before speech started
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_AGGRESSIVENESS = 3
+END_SILENCE_MS = 300
+SPEECH_PAD_MS = 120
+
+# Utterances that end the conversation, matched against the whole normalized
+# transcript in one pass (trailing punctuation allowed, as some recognizers add it)
+EXIT_RE = re.compile(r"(?:quit|exit|stop|cancel|bye|bye bye|goodbye|good bye|never ?mind|that'?s all)[.!?]*")
+
+# Number of distinct utterances whose responses are remembered, and for how
+# long: replies are picked by time of day, so a cached one soon goes stale
+RESPONSE_CACHE_SIZE = 256
+RESPONSE_TTL_SECONDS = 3600
+
+# Replies reporting a failure are never cached, so an outage isn't replayed
+# after the service recovers
+ERROR_REPLY_RE = re.compile(r"try again|rephras|\berror\b", re.IGNORECASE)
+
+# Utterances mentioning the user or the bot depend on stored user info and
+# conversation context, so they always go to the chatbot instead of the cache
+CONTEXT_DEPENDENT_RE = re.compile(r"\b(i|me|my|you|your)\b")
+
+# Sentence embedding model for the semantic cache, and the cosine similarity
+# above which two utterances are treated as the same question
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.90
+
+# Local speech recognition model (faster-whisper), run on the CPU with int8 weights
+WHISPER_MODEL = "small.en"
+
+# Interim transcripts at least this stable (as reported by the streaming
+# recognizer) are answered speculatively while recognition finishes
+SPECULATION_MIN_STABILITY = 0.8
+
+class SemanticCache:
+    """
+    Responses to earlier utterances, looked up by embedding similarity
+    
+    Embeddings are normalized, so one matrix-vector product gives the cosine
+    similarity of a new utterance to every cached one. Entries older than
+    the TTL are ignored.
+    """
+    
+    def __init__(self, embedder, threshold=SEMANTIC_CACHE_THRESHOLD, max_entries=RESPONSE_CACHE_SIZE,
+                 ttl=RESPONSE_TTL_SECONDS):
+        self.embedder = embedder
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl = ttl
+        dim = embedder.get_sentence_embedding_dimension()
+        self.embeddings = np.zeros((0, dim), dtype=np.float32)
+        self.times = np.zeros(0)
+        self.responses = []
+    
+    def embed(self, text):
+        """Return the normalized embedding of a text"""
+        return self.embedder.encode(text, normalize_embeddings=True).astype(np.float32)
+    
+    def lookup(self, embedding):
+        """Return the response cached for the most similar utterance, or None"""
+        if not self.responses:
+            return None
+        similarities = self.embeddings @ embedding
+        similarities[self.times < time.time() - self.ttl] = -1.0
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return self.responses[best]
+        return None
+    
+    def load(self, rows):
+        """Add stored (embedding bytes, response, timestamp) rows, skipping other embedding sizes"""
+        for blob, response, ts in rows:
+            embedding = np.frombuffer(blob, dtype=np.float32)
+            if embedding.shape[0] == self.embeddings.shape[1]:
+                self.add(embedding, response, ts)
+    
+    def add(self, embedding, response, ts=None):
+        """Cache a response, dropping the oldest entries beyond max_entries"""
+        self.embeddings = np.vstack((self.embeddings, embedding))[-self.max_entries:]
+        self.times = np.append(self.times, time.time() if ts is None else ts)[-self.max_entries:]
+        self.responses.append(response)
+        del self.responses[:-self.max_entries]
+
+class Speaker:
+    """
+    Text-to-speech output that renders fixed phrases to WAV files once
+    
+    Phrases passed to the constructor are synthesized into SPEECH_CACHE_DIR
+    (only those not already rendered with the current voice and rate by an
+    earlier session) and played back from disk; any other text goes through
+    the engine.
+    
+    The engine runs in pyttsx3's external event loop mode, driven by say()
+    in small steps, so that interrupt() can cut playback short from another
+    thread. All other methods must be called on the thread that created the
+    engine.
+    """
+    
+    def __init__(self, engine, phrases=(), cache_dir=SPEECH_CACHE_DIR):
+        self.engine = engine
+        self.cache_dir = cache_dir
+        self.wav_files = {}
+        self._interrupted = threading.Event()
+        
+        if phrases and (simpleaudio is not None or winsound is not None):
+            try:
+                self._render(phrases)
+            except Exception as e:
+                logger.warning(f"Could not pre-render phrases, synthesizing them on demand: {e}")
+                self.wav_files = {}
+        
+        # Some drivers have no external loop; runAndWait is used for those
+        try:
+            self.engine.startLoop(False)
+            self._external_loop = True
+        except Exception as e:
+            logger.warning(f"Speech can't be interrupted with this TTS driver: {e}")
+            self._external_loop = False
+    
+    def _wav_path(self, text):
+        """Cache file for a phrase, named by the phrase and the voice settings"""
+        key = f"{self.engine.getProperty('voice')}|{self.engine.getProperty('rate')}|{text}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".wav")
+    
+    def _render(self, phrases):
+        """Synthesize the phrases that aren't cached yet to WAV files"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        paths = {text: self._wav_path(text) for text in phrases}
+        
+        missing = {text: path for text, path in paths.items() if not os.path.exists(path)}
+        if missing:
+            for text, path in missing.items():
+                self.engine.save_to_file(text, path)
+            self.engine.runAndWait()
+        
+        # Some drivers can't write files; keep only the phrases that rendered
+        self.wav_files = {text: path for text, path in paths.items()
+                          if os.path.exists(path) and os.path.getsize(path) > 0}
+    
+    def _play_wav(self, path):
+        """Play a WAV file until it ends or playback is interrupted"""
+        if simpleaudio is None:
+            winsound.PlaySound(path, winsound.SND_FILENAME)
+            return
+        
+        playback = simpleaudio.WaveObject.from_wave_file(path).play()
+        while playback.is_playing():
+            if self._interrupted.is_set():
+                playback.stop()
+                break
+            time.sleep(SPEECH_POLL_SECONDS)
+    
+    def say(self, text):
+        """Speak text, playing its pre-rendered audio when there is one"""
+        self._interrupted.clear()
+        
+        path = self.wav_files.get(text)
+        if path is not None:
+            try:
+                self._play_wav(path)
+                return
+            except Exception as e:
+                logger.warning(f"Could not play pre-rendered audio: {e}")
+                del self.wav_files[text]
+        
+        self.engine.say(text)
+        if not self._external_loop:
+            self.engine.runAndWait()
+            return
+        
+        self.engine.iterate()
+        while self.engine.isBusy():
+            if self._interrupted.is_set():
+                self.engine.stop()
+                break
+            time.sleep(SPEECH_POLL_SECONDS)
+            self.engine.iterate()
+    
+    def interrupt(self):
+        """Stop the phrase being spoken, if any (safe to call from any thread)"""
+        self._interrupted.set()
+    
+    def close(self):
+        """Shut down the engine's event loop"""
+        if self._external_loop:
+            self.engine.endLoop()
+            self._external_loop = False
+
+class SynthesisService(threading.Thread):
+    """
+    Piper synthesis shared by every speaker in the process
+    
+    One loaded voice serves all sessions. Requests go through a single queue;
+    the worker collects those arriving within MICRO_BATCH_WINDOW_MS of the
+    first and synthesizes each distinct text in the batch once, so
+    simultaneous requests for the same phrase share the work.
+    """
+    
+    def __init__(self, voice):
+        super().__init__(name="piper-synthesis", daemon=True)
+        self.voice = voice
+        self.sample_rate = voice.config.sample_rate
+        self.requests = queue.Queue()
+    
+    def submit(self, text):
+        """Queue text for synthesis, returning a future for its 16-bit samples"""
+        future = Future()
+        self.requests.put((text, future))
+        return future
+    
+    def synthesize(self, text):
+        """Synthesize text to 16-bit mono samples, waiting for the result"""
+        return self.submit(text).result()
+    
+    def _synthesize(self, text):
+        if hasattr(self.voice, "synthesize_stream_raw"):
+            pcm = b"".join(self.voice.synthesize_stream_raw(text))
+        else:
+            pcm = b"".join(chunk.audio_int16_bytes for chunk in self.voice.synthesize(text))
+        return np.frombuffer(pcm, dtype=np.int16)
+    
+    def run(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + MICRO_BATCH_WINDOW_MS / 1000
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            futures_by_text = {}
+            for text, future in batch:
+                futures_by_text.setdefault(text, []).append(future)
+            
+            for text, futures in futures_by_text.items():
+                try:
+                    samples = self._synthesize(text)
+                except Exception as e:
+                    for future in futures:
+                        future.set_exception(e)
+                else:
+                    for future in futures:
+                        future.set_result(samples)
+
+# Synthesis services by voice model path, created by get_synthesis_service()
+_synthesis_services = {}
+_synthesis_services_lock = threading.Lock()
+
+def get_synthesis_service(voice_path):
+    """Return the shared synthesis service for a Piper voice, loading it on first use"""
+    with _synthesis_services_lock:
+        service = _synthesis_services.get(voice_path)
+        if service is None:
+            service = SynthesisService(PiperVoice.load(voice_path))
+            service.start()
+            _synthesis_services[voice_path] = service
+        return service
+
+class PiperSpeaker:
+    """
+    Text-to-speech output through a Piper neural voice
+    
+    Fixed phrases are synthesized once at startup and kept in memory. Each
+    speaker plays through its own output stream, so speakers sharing the
+    synthesis service don't cut each other off. Offers the same
+    say/interrupt/close interface as Speaker.
+    """
+    
+    def __init__(self, service, phrases=()):
+        self.service = service
+        self.sample_rate = service.sample_rate
+        self._interrupted = threading.Event()
+        self.stream = sounddevice.OutputStream(samplerate=self.sample_rate, channels=1, dtype="int16")
+        
+        # Submitted together so they are synthesized as one batch
+        futures = {text: service.submit(text) for text in phrases}
+        self.rendered = {text: future.result() for text, future in futures.items()}
+    
+    def say(self, text):
+        """Speak text, using its pre-rendered audio when there is one"""
+        self._interrupted.clear()
+        samples = self.rendered.get(text)
+        if samples is None:
+            samples = self.service.synthesize(text)
+        
+        # Written in blocks of SPEECH_POLL_SECONDS so an interrupt takes effect promptly
+        block = max(1, int(self.sample_rate * SPEECH_POLL_SECONDS))
+        samples = samples.reshape(-1, 1)
+        self.stream.start()
+        for start in range(0, len(samples), block):
+            if self._interrupted.is_set():
+                self.stream.abort()
+                return
+            self.stream.write(samples[start:start + block])
+        # Returns once the buffered audio has been played
+        self.stream.stop()
+    
+    def interrupt(self):
+        """Stop the phrase being spoken, if any (safe to call from any thread)"""
+        self._interrupted.set()
+    
+    def close(self):
+        self.stream.close()
+
+def create_speaker(phrases=()):
+    """
+    Initialize text-to-speech and pre-render fixed phrases
+    
+    Uses the Piper voice at PIPER_VOICE when Piper is installed and the model
+    exists, otherwise the system engine through pyttsx3. Called on the TTS
+    thread, since some pyttsx3 drivers only work on the thread that created
+    the engine.
+    """
+    if PiperVoice is not None and os.path.exists(PIPER_VOICE):
+        try:
+            speaker = PiperSpeaker(get_synthesis_service(PIPER_VOICE), phrases)
+            logger.info(f"Using Piper voice {os.path.basename(PIPER_VOICE)}")
+            return speaker
+        except Exception as e:
+            logger.warning(f"Could not load Piper voice, using the system TTS engine: {e}")
+    
+    engine = pyttsx3.init()
+    # Adjust speech rate (default is 200)
+    engine.setProperty('rate', 175)
+    return Speaker(engine, phrases)
+
+class Listener(threading.Thread):
+    """
+    Captures utterances from the microphone on a background thread
+    
+    After each utterance listening pauses until resume() is called, so the
+    bot's own replies are never recorded. Captured audio, or the error that
+    stopped a capture, is handed over through a bounded queue. The energy
+    threshold is measured before the first utterance and again every
+    CALIBRATION_INTERVAL utterances or after recalibrate().
+    
+    When webrtcvad is available and the stream is 16-bit at a rate it
+    supports, utterances are segmented by voice activity detection instead
+    of the energy threshold, ending END_SILENCE_MS after speech stops.
+    """
+    
+    def __init__(self, recognizer, source):
+        super().__init__(name="listener", daemon=True)
+        self.recognizer = recognizer
+        self.source = source
+        self.utterances = queue.Queue(maxsize=1)
+        self._resumed = threading.Event()
+        self._stopped = threading.Event()
+        self._recalibrate = threading.Event()
+        self._recalibrate.set()
+        
+        # Use the measured threshold as is rather than adapting it while listening
+        self.recognizer.dynamic_energy_threshold = False
+        
+        self.vad = None
+        if (webrtcvad is not None and source.SAMPLE_WIDTH == 2
+                and source.SAMPLE_RATE in (8000, 16000, 32000, 48000)):
+            self.vad = webrtcvad.Vad(VAD_AGGRESSIVENESS)
+    
+    def _listen_vad(self):
+        """
+        Record one utterance, ending it when the VAD hears END_SILENCE_MS of silence
+        
+        Raises:
+            sr.WaitTimeoutError: If no speech starts within LISTEN_POLL_SECONDS
+        """
+        rate = self.source.SAMPLE_RATE
+        frame_samples = rate * VAD_FRAME_MS // 1000
+        start_frames = int(LISTEN_POLL_SECONDS * 1000) // VAD_FRAME_MS
+        max_frames = PHRASE_TIME_LIMIT * 1000 // VAD_FRAME_MS
+        end_silence_frames = max(1, END_SILENCE_MS // VAD_FRAME_MS)
+        
+        # Recent non-speech frames, prepended as padding once speech starts
+        pre_speech = deque(maxlen=max(1, SPEECH_PAD_MS // VAD_FRAME_MS))
+        for _ in range(start_frames):
+            frame = self.source.stream.read(frame_samples)
+            if self.vad.is_speech(frame, rate):
+                frames = list(pre_speech)
+                frames.append(frame)
+                break
+            pre_speech.append(frame)
+        else:
+            raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+        
+        silent = 0
+        while silent < end_silence_frames and len(frames) < max_frames:
+            frame = self.source.stream.read(frame_samples)
+            frames.append(frame)
+            silent = 0 if self.vad.is_speech(frame, rate) else silent + 1
+        
+        return sr.AudioData(b"".join(frames), rate, self.source.SAMPLE_WIDTH)
+    
+    def _listen(self):
+        """Record one utterance"""
+        if self.vad is not None:
+            return self._listen_vad()
+        return self.recognizer.listen(
+            self.source, timeout=LISTEN_POLL_SECONDS, phrase_time_limit=PHRASE_TIME_LIMIT
+        )
+    
+    def run(self):
+        captured = 0
+        while not self._stopped.is_set():
+            if not self._resumed.wait(LISTEN_POLL_SECONDS):
+                continue
+            
+            try:
+                # The energy threshold only matters without the VAD
+                if self.vad is None and (self._recalibrate.is_set() or captured >= CALIBRATION_INTERVAL):
+                    self.recognizer.adjust_for_ambient_noise(self.source, duration=1.0)
+                    self._recalibrate.clear()
+                    captured = 0
+                
+                item = self._listen()
+                captured += 1
+            except sr.WaitTimeoutError:
+                continue
+            except Exception as e:
+                item = e
+            
+            self._resumed.clear()
+            self.utterances.put(item)
+    
+    def resume(self):
+        """Start listening for the next utterance"""
+        self._resumed.set()
+    
+    def recalibrate(self):
+        """Measure the ambient noise again before the next utterance"""
+        self._recalibrate.set()
+    
+    def next_utterance(self):
+        """Wait for the next captured utterance, re-raising capture errors"""
+        while True:
+            # Wait in short steps so Ctrl-C is handled promptly on every platform
+            try:
+                item = self.utterances.get(timeout=LISTEN_POLL_SECONDS)
+            except queue.Empty:
+                continue
+            if isinstance(item, Exception):
+                raise item
+            return item
+    
+    def stop(self):
+        """Stop listening; the thread exits once the current capture ends"""
+        self._stopped.set()
+
+class CloudSpeechTranscriber:
+    """
+    Speech-to-text through Google Cloud Speech streaming recognition
+    
+    The client, and with it the gRPC channel, is created once and reused for
+    every utterance. Errors are raised as the SpeechRecognition exceptions so
+    callers handle both backends the same way.
+    """
+    
+    # Audio is sent as uncompressed 16-bit PCM at this rate, in requests of CHUNK_SIZE bytes
+    SAMPLE_RATE = 16000
+    CHUNK_SIZE = 8192
+    
+    def __init__(self, language="en-US"):
+        self.client = cloud_speech.SpeechClient()
+        self.language = language
+    
+    def __call__(self, audio, on_interim=None):
+        """
+        Transcribe captured audio
+        
+        Args:
+            audio (sr.AudioData): The captured utterance
+            on_interim (callable, optional): Called with (transcript, stability)
+                for each interim hypothesis
+            
+        Returns:
+            str: The final transcript
+        """
+        config = cloud_speech.StreamingRecognitionConfig(
+            config=cloud_speech.RecognitionConfig(
+                encoding=cloud_speech.RecognitionConfig.AudioEncoding.LINEAR16,
+                sample_rate_hertz=self.SAMPLE_RATE,
+                language_code=self.language
+            ),
+            interim_results=on_interim is not None
+        )
+        # Raw PCM is converted in-process; FLAC would mean running the flac encoder per utterance
+        data = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        requests = (
+            cloud_speech.StreamingRecognizeRequest(audio_content=data[i:i + self.CHUNK_SIZE])
+            for i in range(0, len(data), self.CHUNK_SIZE)
+        )
+        
+        transcript = []
+        try:
+            for response in self.client.streaming_recognize(config, requests):
+                for result in response.results:
+                    if not result.alternatives:
+                        continue
+                    if result.is_final:
+                        transcript.append(result.alternatives[0].transcript.strip())
+                    elif on_interim is not None:
+                        on_interim(result.alternatives[0].transcript, result.stability)
+        except google_exceptions.GoogleAPICallError as e:
+            raise sr.RequestError(str(e)) from e
+        
+        if not transcript:
+            raise sr.UnknownValueError()
+        return " ".join(transcript)
+
+class WhisperTranscriber:
+    """Local speech-to-text with faster-whisper, loaded once per session"""
+    
+    # Sample rate Whisper models expect
+    SAMPLE_RATE = 16000
+    
+    def __init__(self, model_size=WHISPER_MODEL):
+        self.model = WhisperModel(model_size, device="cpu", compute_type="int8")
+    
+    def __call__(self, audio, on_interim=None):
+        """Transcribe captured audio, returning the transcript"""
+        pcm = audio.get_raw_data(convert_rate=self.SAMPLE_RATE, convert_width=2)
+        samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+        
+        segments, _ = self.model.transcribe(samples, beam_size=1, language="en")
+        transcript = " ".join(segment.text.strip() for segment in segments).strip()
+        if not transcript:
+            raise sr.UnknownValueError()
+        return transcript
+
+def create_transcriber(recognizer):
+    """
+    Pick the speech-to-text backend
+    
+    Returns:
+        callable: Takes captured audio (and an optional on_interim callback,
+            used only by backends with interim results) and returns its transcript
+    """
+    if WhisperModel is not None:
+        try:
+            transcriber = WhisperTranscriber()
+            logger.info(f"Using local Whisper model {WHISPER_MODEL}")
+            return transcriber
+        except Exception as e:
+            logger.warning(f"Could not load Whisper model, using a cloud service instead: {e}")
+    
+    if cloud_speech is not None:
+        try:
+            transcriber = CloudSpeechTranscriber()
+            logger.info("Using Google Cloud Speech streaming recognition")
+            return transcriber
+        except Exception as e:
+            logger.warning(f"Google Cloud Speech unavailable, using the web API instead: {e}")
+    
+    def transcribe(audio, on_interim=None):
+        return recognizer.recognize_google(audio)
+    return transcribe
+
+class ResponseStore:
+    """
+    Responses from earlier sessions, with their embeddings, kept in SQLite
+    
+    Entries older than the TTL are ignored, and dropped when the store is opened. Writes
+    go through a background thread with its own connection, so a turn never
+    waits for the disk; reads use the main connection, which is shared with
+    the speculation thread (never active at the same time as the main thread).
+    """
+    
+    def __init__(self, path=RESPONSE_DB, ttl=RESPONSE_TTL_SECONDS):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.ttl = ttl
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "norm TEXT PRIMARY KEY, response TEXT NOT NULL, embedding BLOB, ts REAL NOT NULL)"
+        )
+        with self.conn:
+            self.conn.execute("DELETE FROM responses WHERE ts < ?", (time.time() - ttl,))
+        
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="response-store")
+        self._write_conn = None  # Opened on the writer thread
+    
+    def get(self, norm):
+        """Return the stored response for a normalized utterance, or None"""
+        row = self.conn.execute(
+            "SELECT response FROM responses WHERE norm = ? AND ts >= ?", (norm, time.time() - self.ttl)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def put(self, norm, response, embedding=None):
+        """Queue a response for storing, with the utterance's embedding if there is one"""
+        blob = np.asarray(embedding, dtype=np.float32).tobytes() if embedding is not None else None
+        self._writer.submit(self._write, (norm, response, blob, time.time()))
+    
+    def _write(self, row):
+        """Insert a row (runs on the writer thread)"""
+        try:
+            if self._write_conn is None:
+                self._write_conn = sqlite3.connect(self.path)
+            with self._write_conn:
+                self._write_conn.execute(
+                    "INSERT OR REPLACE INTO responses (norm, response, embedding, ts) VALUES (?, ?, ?, ?)",
+                    row
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not store response: {e}")
+    
+    def recent_embeddings(self, limit):
+        """Return (embedding bytes, response, timestamp) for the newest embedded entries, oldest first"""
+        rows = self.conn.execute(
+            "SELECT embedding, response, ts FROM responses WHERE embedding IS NOT NULL AND ts >= ? "
+            "ORDER BY ts DESC LIMIT ?", (time.time() - self.ttl, limit)
+        ).fetchall()
+        return rows[::-1]
+    
+    def close(self):
+        """Finish queued writes and close the connections"""
+        self._writer.submit(self._close_writer)
+        self._writer.shutdown()
+        self.conn.close()
+    
+    def _close_writer(self):
+        if self._write_conn is not None:
+            self._write_conn.close()
+            self._write_conn = None
+
+def open_response_store():
+    """
+    Open the persistent response store
+    
+    Returns:
+        ResponseStore: The store, or None if the database can't be opened
+    """
+    try:
+        return ResponseStore()
+    except sqlite3.Error as e:
+        logger.warning(f"Response cache won't persist between sessions: {e}")
+        return None
+
+def load_semantic_cache():
+    """
+    Create the semantic response cache if sentence-transformers is available
+    
+    Returns:
+        SemanticCache: The cache, or None if it can't be created
+    """
+    if SentenceTransformer is None:
+        return None
+    try:
+        return SemanticCache(SentenceTransformer(EMBEDDING_MODEL))
+    except Exception as e:
+        logger.warning(f"Semantic response cache disabled: {e}")
+        return None
+
+# Chatbot shared by every conversation in this process, created by get_chatbot()
+_CHATBOT = None
+
+def get_chatbot():
+    """
+    Return the chatbot, creating it on first use
+    
+    Creating ImprovedChat compiles the regexes of every pattern pair, so the
+    instance is kept for later calls. The chatbot module is imported here
+    rather than at module level: it also loads the ML model and user memory,
+    which importers of this module's helpers don't need.
+    """
+    global _CHATBOT
+    if _CHATBOT is None:
+        from chatbot.chatbot import ImprovedChat, pairs, reflections, bot_name
+        _CHATBOT = ImprovedChat(pairs, reflections, bot_name)
+    return _CHATBOT
 
 def main():
     """
     Run a voice-enabled version of the chatbot in console mode
     """
     try:
+        # Initialize chatbot
+        chatbot = get_chatbot()
+        chatbot.set_user_id("voice_user")
+        bot_name = chatbot.bot_name
+        
         print(f"Starting voice-enabled chatbot - {bot_name}")
         print("Say 'quit' or 'exit' to end the conversation")
 
-        # Initialize chatbot
-        chatbot = ImprovedChat(pairs, reflections, bot_name)
-        chatbot.set_user_id("voice_user")
+        
+        # Repeated questions reuse the earlier answer for RESPONSE_TTL_SECONDS
+        # instead of re-running the chatbot's pattern matching; with an
+        # embedding model, so do paraphrases of them. Answers are also stored
+        # for later sessions. Callback replies (weather, memory) and failures
+        # always come from the chatbot.
+        response_store = open_response_store()
+        semantic_cache = load_semantic_cache()
+        if semantic_cache is not None and response_store is not None:
+            semantic_cache.load(response_store.recent_embeddings(RESPONSE_CACHE_SIZE))
+        
+        recent = OrderedDict()  # Normalized utterance -> (response, time), most recently used last
+        
+        def remember(norm, response):
+            recent[norm] = (response, time.time())
+            recent.move_to_end(norm)
+            if len(recent) > RESPONSE_CACHE_SIZE:
+                recent.popitem(last=False)
+        
+        def lookup(norm):
+            """Return (cached response or None, utterance embedding or None)"""
+            entry = recent.get(norm)
+            if entry is not None and entry[1] >= time.time() - RESPONSE_TTL_SECONDS:
+                recent.move_to_end(norm)
+                return entry[0], None
+            
+            response = response_store.get(norm) if response_store is not None else None
+            if response is not None:
+                remember(norm, response)
+                return response, None
+            
+            embedding = None
+            if semantic_cache is not None:
+                embedding = semantic_cache.embed(norm)
+                response = semantic_cache.lookup(embedding)
+            return response, embedding
+        
+        def store(norm, response, embedding):
+            """Cache a response from the chatbot unless it reports a failure"""
+            if ERROR_REPLY_RE.search(response):
+                return
+            remember(norm, response)
+            if semantic_cache is not None:
+                semantic_cache.add(embedding, response)
+            if response_store is not None:
+                response_store.put(norm, response, embedding)
+        
+        def cached_respond(norm, user_input, guess=None):
+            """
+            Answer an utterance from the caches or the chatbot
+            
+            norm is only the cache key; the chatbot gets user_input as
+            transcribed. guess is the speculative answer to this same utterance, if one
+            was started; its chatbot state and response are kept.
+            """
+            if guess is not None and guess.exception() is None:
+                response, embedding, state = guess.result()
+                if state is not None:
+                    chatbot.conversation_history, chatbot.previous_responses = state
+                    store(norm, response, embedding)
+                return response
+            
+            if chatbot.uses_callback(user_input):
+                return chatbot.respond(user_input)
+            
+            response, embedding = lookup(norm)
+            if response is None:
+                response = chatbot.respond(user_input)
+                store(norm, response, embedding)
+            return response
+        
+        def speculative_respond(norm, user_input):
+            """
+            Answer an interim transcript without caching the result
+            
+            Returns (response, embedding, state), where state is the chatbot's
+            (conversation_history, previous_responses) after answering, or
+            None for a cached response. The chatbot itself is put back as it
+            was, since the user may not end up saying this.
+            """
+            response, embedding = lookup(norm)
+            if response is not None:
+                return response, embedding, None
+            
+            history = list(chatbot.conversation_history)
+            previous = dict(chatbot.previous_responses)
+            try:
+                response = chatbot.respond(user_input)
+                state = (chatbot.conversation_history, chatbot.previous_responses)
+            finally:
+                chatbot.conversation_history, chatbot.previous_responses = history, previous
+            return response, embedding, state
 
+        # While streaming recognition is still running, stable interim
+        # transcripts are answered on a worker thread. An answer is used (and
+        # cached) only if the final transcript turns out the same; the others
+        # are dropped. Each turn waits for this before touching the chatbot
+        # itself, so it is never used from two threads at once.
+        respond_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="respond")
+        speculated = {}  # Normalized interim transcript -> future, for the current turn
+        
+        def speculate(text, stability):
+            """Start answering an interim transcript if it is stable and cacheable"""
+            norm = text.lower().strip()
+            if (stability >= SPECULATION_MIN_STABILITY and norm and norm not in speculated
+                    and not EXIT_RE.fullmatch(norm) and not CONTEXT_DEPENDENT_RE.search(norm)
+                    and not chatbot.uses_callback(text)):
+                speculated[norm] = respond_pool.submit(speculative_respond, norm, text.strip())
+        
         # Initialize speech recognition
         recognizer = sr.Recognizer()
+        transcribe = create_transcriber(recognizer)
         
         # Check if microphone is available
         mics = sr.Microphone.list_microphone_names()
@@ -53,77 +932,124 @@ def main():
         
         logger.info(f"Found {len(mics)} microphone(s): {', '.join(mics[:3])}{' and more...' if len(mics) > 3 else ''}")
         
-        # Initialize text-to-speech engine
-        engine = pyttsx3.init()
-        # Adjust speech rate (default is 200)
-        engine.setProperty('rate', 175)
+        # Speech is synthesized and played on its own thread, so the main
+        # thread can reopen the microphone while a reply is still playing.
+        # The fixed phrases are rendered once, so errors and goodbyes play instantly.
+        tts_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
+        welcome_msg = f"Hello! I'm {bot_name}. How can I help you today?"
+        speaker = tts_pool.submit(
+            create_speaker, (welcome_msg, FAREWELL_MSG, NOT_UNDERSTOOD_MSG, SPEECH_SERVICE_ERROR_MSG)
+        ).result()
+        
+        speech = None  # Playback of the last queued phrase
+        
+        def speak(text):
+            """Queue text for playback on the TTS thread"""
+            nonlocal speech
+            speech = tts_pool.submit(speaker.say, text)
+        
+        def finish_speaking():
+            """Wait until everything queued has been spoken"""
+            nonlocal speech
+            if speech is not None:
+                pending, speech = speech, None
+                try:
+                    pending.result()
+                except Exception as e:
+                    logger.error(f"Error speaking response: {e}")
         
         # Say welcome message
-        welcome_msg = f"Hello! I'm {bot_name}. How can I help you today?"
         print(f"{bot_name}: {welcome_msg}")
-        engine.say(welcome_msg)
-        engine.runAndWait()
+        speak(welcome_msg)
         
-        # Main conversation loop
-        while True:
-            # Get user input via microphone
-            try:
-                with sr.Microphone() as source:
-                    print("\nListening...")
+        misses = 0  # Unrecognized utterances in a row
+        
+        # Main conversation loop, with the microphone stream opened once for
+        # the session and read by the listener thread
+        with sr.Microphone(sample_rate=VAD_SAMPLE_RATE if webrtcvad is not None else None) as source:
+            listener = Listener(recognizer, source)
+            listener.start()
+            
+            while True:
+                # Get user input via microphone
+                try:
+                    # Let the last reply finish so the microphone doesn't pick it up
+                    finish_speaking()
+                    
+                    # Re-measure ambient noise if speech keeps going unrecognized
+                    if misses >= MAX_MISSES_BEFORE_CALIBRATION:
+                        listener.recalibrate()
+                        misses = 0
                     
-                    # Adjust for ambient noise
-                    recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                    print("\nListening...")
                     
                     # Listen for user input
-                    audio = recognizer.listen(source, timeout=5, phrase_time_limit=5)
+                    listener.resume()
+                    audio = listener.next_utterance()
                     
                     print("Processing speech...")
                     try:
                         # Recognize speech using Google Speech Recognition
-                        user_input = recognizer.recognize_google(audio)
+                        try:
+                            user_input = transcribe(audio, on_interim=speculate)
+                        finally:
+                            wait(speculated.values())
+                            guesses = dict(speculated)
+                            speculated.clear()
                         print(f"You: {user_input}")
+                        misses = 0
                         
                         # Check for exit command
-                        if user_input.lower() in ["quit", "exit", "bye", "goodbye"]:
-                            farewell = "Goodbye! Have a great day!"
-                            print(f"{bot_name}: {farewell}")
-                            engine.say(farewell)
-                            engine.runAndWait()
+                        norm = user_input.lower().strip()
+                        if EXIT_RE.fullmatch(norm):
+                            print(f"{bot_name}: {FAREWELL_MSG}")
+                            speak(FAREWELL_MSG)
                             break
                         
                         # Get chatbot response
-                        response = chatbot.respond(user_input)
+                        if CONTEXT_DEPENDENT_RE.search(norm):
+                            response = chatbot.respond(user_input)
+                        else:
+                            response = cached_respond(norm, user_input, guesses.get(norm))
                         print(f"{bot_name}: {response}")
                         
                         # Read response aloud
-                        engine.say(response)
-                        engine.runAndWait()
+                        speak(response)
                         
                     except sr.UnknownValueError:
-                        error_msg = "Sorry, I couldn't understand what you said. Could you try again?"
-                        print(f"{bot_name}: {error_msg}")
-                        engine.say(error_msg)
-                        engine.runAndWait()
+                        misses += 1
+                        print(f"{bot_name}: {NOT_UNDERSTOOD_MSG}")
+                        speak(NOT_UNDERSTOOD_MSG)
                         
                     except sr.RequestError as e:
                         error_msg = f"Sorry, there was an error with the speech service: {e}"
                         print(f"{bot_name}: {error_msg}")
-                        engine.say("Sorry, there was an error with the speech service.")
-                        engine.runAndWait()
+                        speak(SPEECH_SERVICE_ERROR_MSG)
                         
-            except KeyboardInterrupt:
-                print("\nDetected keyboard interrupt. Exiting...")
-                farewell = "Goodbye! Have a great day!"
-                print(f"{bot_name}: {farewell}")
-                engine.say(farewell)
-                engine.runAndWait()
-                break
+                except KeyboardInterrupt:
+                    print("\nDetected keyboard interrupt. Exiting...")
+                    # The user wants out now: cut off any reply and print the
+                    # goodbye without speaking it
+                    speaker.interrupt()
+                    print(f"{bot_name}: {FAREWELL_MSG}")
+                    break
                 
-            except Exception as e:
-                logger.error(f"Unexpected error: {e}")
-                print(f"An error occurred: {e}")
-                print("Continuing with the conversation...")
-                continue
+                except Exception as e:
+                    logger.error(f"Unexpected error: {e}")
+                    print(f"An error occurred: {e}")
+                    print("Continuing with the conversation...")
+                    continue
+            
+            # Stop reading the stream before it is closed
+            listener.stop()
+            listener.join()
+        
+        finish_speaking()
+        tts_pool.submit(speaker.close).result()
+        tts_pool.shutdown()
+        respond_pool.shutdown()
+        if response_store is not None:
+            response_store.close()
     
     except Exception as e:
         logger.error(f"Critical error in main: {e}")